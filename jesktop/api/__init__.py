@@ -1,13 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.sessions import SessionMiddleware
 
+from jesktop.api.auth import StaticExemptSessionMiddleware
 from jesktop.api.endpoints import get_endpoints_router
 from jesktop.api.views import get_views_router
 from jesktop.config import settings
 from jesktop.embedders.base import Embedder
 from jesktop.image_store import ImageStore
 from jesktop.llms.base import LLMChat
+from jesktop.llms.semantic_response_cache import SemanticResponseCache
 from jesktop.vector_dbs.base import VectorDB
 
 
@@ -17,12 +18,13 @@ def create_app(
     embedder: Embedder,
     chatbot: LLMChat,
     image_store: ImageStore,
+    response_cache: SemanticResponseCache | None = None,
 ) -> FastAPI:
     """Create FastAPI app."""
     app = FastAPI()
 
     # Add session middleware first
-    app.add_middleware(SessionMiddleware, secret_key=settings.session_secret)
+    app.add_middleware(StaticExemptSessionMiddleware, secret_key=settings.session_secret)
 
     app.add_middleware(
         CORSMiddleware,
@@ -34,7 +36,11 @@ def create_app(
 
     app.include_router(
         router=get_endpoints_router(
-            vector_db=vector_db, embedder=embedder, chatbot=chatbot, image_store=image_store
+            vector_db=vector_db,
+            embedder=embedder,
+            chatbot=chatbot,
+            image_store=image_store,
+            response_cache=response_cache,
         )
     )
     app.include_router(router=get_views_router(vector_db=vector_db))
@@ -2,6 +2,8 @@ import secrets
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from starlette.middleware.sessions import SessionMiddleware
+from starlette.types import Receive, Scope, Send
 
 from jesktop.config import settings
 
@@ -42,3 +44,13 @@ def verify_session(request: Request) -> str:
 def is_authenticated(request: Request) -> bool:
     """Check if user is authenticated via session."""
     return bool(request.session.get("authenticated"))
+
+
+class StaticExemptSessionMiddleware(SessionMiddleware):
+    """Session middleware that skips cookie verification for public static assets."""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
@@ -1,8 +1,11 @@
+import asyncio
+import time
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator
 from urllib.parse import unquote
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import Response, StreamingResponse
 from loguru import logger
 
@@ -12,57 +15,121 @@ from jesktop.embedders.base import Embedder
 from jesktop.image_store import ImageStore
 from jesktop.llms.base import LLMChat
 from jesktop.llms.schemas import LLMMessage
+from jesktop.llms.semantic_response_cache import SemanticResponseCache
 from jesktop.prompt import get_prompt
 from jesktop.vector_dbs.base import VectorDB
 
+_FLUSH_BYTES = 16 * 1024
+_FLUSH_SECONDS = 0.01
+# Images up to this size are sent in one response body; larger ones are streamed from the store
+_STREAM_IMAGE_BYTES = 1024 * 1024
+_ERROR_PREFIX = b"event: error\ndata: "
+_FRAME_END = b"\n\n"
+_NO_MESSAGE_FRAME = _ERROR_PREFIX + b"No message provided" + _FRAME_END
 
-def stream_response(
-    answer_generator: Generator[LLMMessage, None, None],
-) -> Generator[str, None, None]:
+
+def _error_frame(error: Exception) -> bytes:
+    """Format an exception as an SSE error event."""
+    return _ERROR_PREFIX + str(error).encode("utf-8", "replace") + _FRAME_END
+
+
+async def _single_frame(frame: bytes) -> AsyncGenerator[bytes, None]:
+    """Stream a single pre-rendered SSE frame."""
+    yield frame
+
+
+async def stream_response(
+    answer_generator: AsyncGenerator[LLMMessage, None],
+) -> AsyncGenerator[bytes, None]:
     """Format LLM messages as SSE events.
 
     Each message is formatted as an SSE event with 'data: ' prefix for each line.
     Handles multiline content and adds appropriate newlines for SSE format.
+    Events arriving in quick succession are coalesced into a single write, and no event is
+    held back for longer than _FLUSH_SECONDS.
     """
+    buffer = bytearray()
+    flush_deadline = 0.0
+    next_answer: asyncio.Future[LLMMessage] | None = None
     try:
-        for answer in answer_generator:
+        while True:
+            next_answer = asyncio.ensure_future(anext(answer_generator))
+            if buffer:
+                # Wait for the next event only until the buffered events are due
+                timeout = max(flush_deadline - time.monotonic(), 0.0)
+                done, _ = await asyncio.wait({next_answer}, timeout=timeout)
+                if not done:
+                    yield bytes(buffer)
+                    buffer.clear()
+            try:
+                answer = await next_answer
+            except StopAsyncIteration:
+                break
+
+            if not buffer:
+                flush_deadline = time.monotonic() + _FLUSH_SECONDS
             content = answer.content
-            lines = content.split("\n")
-            data = "\n".join(f"data: {line}" for line in lines)
-            yield f"{data}\n\n"
+            if "\n" in content:
+                content = content.replace("\n", "\ndata: ")
+            buffer += b"data: " + content.encode() + b"\n\n"
+
+            if len(buffer) > _FLUSH_BYTES:
+                yield bytes(buffer)
+                buffer.clear()
 
-        yield "event: done\ndata:\n\n"
+        buffer += b"event: done\ndata:\n\n"
+        yield bytes(buffer)
     except Exception as e:
         logger.error(f"Error in stream: {str(e)}")
-        yield f"event: error\ndata: {str(e)}\n\n"
+        buffer += _error_frame(e)
+        yield bytes(buffer)
+    finally:
+        # The response can be closed while waiting for the next event, e.g. on disconnect
+        if next_answer is not None and not next_answer.done():
+            next_answer.cancel()
 
 
-def _create_chat_endpoint(embedder: Embedder, vector_db: VectorDB, chatbot: LLMChat):
+def _create_chat_endpoint(
+    *,
+    embedder: Embedder,
+    vector_db: VectorDB,
+    chatbot: LLMChat,
+    response_cache: SemanticResponseCache | None,
+):
     """Create the chat endpoint handler."""
+    system_message = LLMMessage(role="system", content=settings.system_message)
+
+    async def answer(message: str) -> AsyncGenerator[LLMMessage, None]:
+        prompt = await run_in_threadpool(
+            get_prompt,
+            input_texts=[message],
+            embedder=embedder,
+            vector_db=vector_db,
+            closest=settings.rag_closest_chunks,
+        )
+
+        messages = [
+            system_message,
+            LLMMessage(role="user", content=prompt),
+        ]
+        return chatbot.chat_stream(messages=messages)
 
     async def chat(
         message: str,
         request: Request,  # noqa: ARG001
-        _: str = Depends(verify_session),
     ) -> StreamingResponse:
         if not message:
             return StreamingResponse(
-                iter(["event: error\ndata: No message provided\n\n"]),
+                _single_frame(_NO_MESSAGE_FRAME),
                 media_type="text/event-stream",
             )
 
         try:
-            messages = [{"role": "user", "content": message}]
-            messages[0]["content"] = get_prompt(
-                input_texts=[messages[0]["content"]],
-                embedder=embedder,
-                vector_db=vector_db,
-                closest=settings.rag_closest_chunks,
-            )
-
-            system_message = [LLMMessage(role="system", content=settings.system_message)]
-            messages = system_message + [LLMMessage.model_validate(m) for m in messages]
-            answer_generator = chatbot.chat_stream(messages=messages)
+            if response_cache is None:
+                answer_generator = await answer(message)
+            else:
+                # Cached answers are keyed on the question, before notes are retrieved for it
+                answer_generator = response_cache.stream(message, lambda: answer(message))
 
             return StreamingResponse(
                 stream_response(answer_generator),
@@ -76,7 +143,7 @@ def _create_chat_endpoint(embedder: Embedder, vector_db: VectorDB, chatbot: LLMC
         except Exception as e:
             logger.error(f"Error in chat: {str(e)}")
             return StreamingResponse(
-                iter([f"event: error\ndata: {str(e)}\n\n"]),
+                _single_frame(_error_frame(e)),
                 media_type="text/event-stream",
             )
 
@@ -89,11 +156,10 @@ def _create_notes_search_endpoint(vector_db: VectorDB):
     async def search_notes_by_title(
         title: str,
         request: Request,  # noqa: ARG001
-        _: str = Depends(verify_session),
     ):
         """Search for a note by title for wikilink resolution."""
         try:
-            note = vector_db.find_note_by_title(title)
+            note = await run_in_threadpool(vector_db.find_note_by_title, title)
             if note:
                 note_stem = Path(note.path).stem
                 return {
@@ -116,32 +182,52 @@ def _create_notes_search_endpoint(vector_db: VectorDB):
     return search_notes_by_title
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check whether an If-None-Match header value matches the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 def _create_image_endpoint(image_store: ImageStore):
     """Create the image endpoint handler."""
 
     async def get_image(
         note_id: str,
         path: str,
-        request: Request,  # noqa: ARG001
-        _: str = Depends(verify_session),
+        request: Request,
     ):
         try:
             decoded_path = unquote(path)
 
-            image_id = image_store.get_image_id_by_path(note_id, decoded_path)
+            image_id = await run_in_threadpool(
+                image_store.get_image_id_by_path, note_id, decoded_path
+            )
             if not image_id:
                 logger.warning(f"Image not found for note {note_id} and path {decoded_path}")
                 raise HTTPException(status_code=404, detail="Image not found")
 
-            image = image_store.get_image(image_id)
+            cache_headers = {
+                "Cache-Control": "public, max-age=31536000",
+                "ETag": f'"{image_id}"',
+            }
+            if _etag_matches(request.headers.get("if-none-match"), cache_headers["ETag"]):
+                return Response(status_code=304, headers=cache_headers)
+
+            mime_type, size = await run_in_threadpool(
+                image_store.get_image_mime_type_and_size, image_id
+            )
             try:
-                return Response(
-                    content=image.content,
-                    media_type=image.mime_type,
-                    headers={
-                        "Cache-Control": "public, max-age=31536000",
-                        "ETag": f'"{image_id}"',
-                    },
+                if size <= _STREAM_IMAGE_BYTES:
+                    image = await run_in_threadpool(image_store.get_image, image_id)
+                    return Response(
+                        content=image.content, media_type=mime_type, headers=cache_headers
+                    )
+                return StreamingResponse(
+                    image_store.iter_image_content(image_id),
+                    media_type=mime_type,
+                    headers={**cache_headers, "Content-Length": str(size)},
                 )
             except Exception as e:
                 logger.error(f"Error processing image content: {e}")
@@ -162,6 +248,7 @@ def get_endpoints_router(
     embedder: Embedder,
     chatbot: LLMChat,
     image_store: ImageStore,
+    response_cache: SemanticResponseCache | None = None,
 ) -> APIRouter:
     router = APIRouter()
 
@@ -169,8 +256,19 @@ def get_endpoints_router(
     async def health_check():
         return {"status": "healthy"}
 
-    router.get("/chat")(_create_chat_endpoint(embedder, vector_db, chatbot))
-    router.get("/api/notes/search")(_create_notes_search_endpoint(vector_db))
-    router.get("/api/images/{note_id}/{path:path}")(_create_image_endpoint(image_store))
+    authenticated_router = APIRouter(dependencies=[Depends(verify_session)])
+    authenticated_router.get("/chat")(
+        _create_chat_endpoint(
+            embedder=embedder,
+            vector_db=vector_db,
+            chatbot=chatbot,
+            response_cache=response_cache,
+        )
+    )
+    authenticated_router.get("/api/notes/search")(_create_notes_search_endpoint(vector_db))
+    authenticated_router.get("/api/images/{note_id}/{path:path}")(
+        _create_image_endpoint(image_store)
+    )
+    router.include_router(authenticated_router)
 
     return router
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Form, HTTPException, Request
 from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 
 from jesktop.api.auth import is_authenticated, verify_basic_auth
 from jesktop.config import settings
@@ -14,7 +15,14 @@ def get_views_router(vector_db: VectorDB) -> APIRouter:  # noqa: C901
     router = APIRouter()
 
     router.mount("/static", StaticFiles(directory=settings.static_dir), name="static")
-    templates = Jinja2Templates(directory="jesktop/web/templates")
+    templates = Jinja2Templates(
+        env=Environment(
+            loader=FileSystemLoader("jesktop/web/templates"),
+            autoescape=True,
+            auto_reload=False,
+            bytecode_cache=FileSystemBytecodeCache(),
+        )
+    )
 
     @router.get("/login", response_class=HTMLResponse)
     async def login_page(request: Request, error: str = None):
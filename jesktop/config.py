@@ -16,7 +16,7 @@ class Settings(BaseSettings):
 
     # Database settings
     local_vector_db_path: str = "data/vector.json"
-    local_image_store_path: str = "data/images.json"
+    local_image_store_path: str = "data/images.db"
 
     # LLM settings
     anthropic_api_key: str
@@ -32,6 +32,10 @@ Use proper Markdown formatting:
 Keep responses clear and well-organized, and always link to the relevant notes when discussing their content.
 """
     rag_closest_chunks: int = 10
+    embedding_cache_size: int = 4096
+    llm_cache_size: int = 256
+    llm_cache_similarity: float = 0.95
+    llm_cache_ttl_seconds: float = 3600.0
     log_level: str = "INFO"  # Can be DEBUG, INFO, WARNING, ERROR, CRITICAL
 
 
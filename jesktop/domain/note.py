@@ -48,8 +48,8 @@ class Chunk(BaseModel):
     end_pos: int
 
 
-def nd_array_before_validator(x: list[float]) -> NDArray[np.float32]:
-    return np.array(x, dtype=np.float32)
+def nd_array_before_validator(x: list[float] | NDArray[np.float32]) -> NDArray[np.float32]:
+    return np.asarray(x, dtype=np.float32)
 
 
 def nd_array_serializer(x: NDArray[np.float32]) -> list[float]:
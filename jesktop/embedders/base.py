@@ -5,3 +5,5 @@ import numpy as np
 
 class Embedder(Protocol):
     def embed(self, text: str) -> np.ndarray: ...
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]: ...
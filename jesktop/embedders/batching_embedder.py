@@ -0,0 +1,59 @@
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+from threading import Thread
+
+import numpy as np
+
+from jesktop.embedders.base import Embedder
+
+
+class BatchingEmbedder:
+    """Embedder wrapper that combines concurrent embed calls into a single batched request.
+
+    Calls made from different threads within max_wait_seconds of each other are sent to the
+    wrapped embedder as one embed_batch call of at most max_batch_size texts.
+    """
+
+    def __init__(
+        self, embedder: Embedder, max_batch_size: int = 32, max_wait_seconds: float = 0.005
+    ) -> None:
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._queue: Queue[tuple[str, Future[np.ndarray]]] = Queue()
+        Thread(target=self._process_batches, daemon=True).start()
+
+    def embed(self, text: str) -> np.ndarray:
+        future: Future[np.ndarray] = Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        return self.embedder.embed_batch(texts)
+
+    def _process_batches(self) -> None:
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = self.embedder.embed_batch(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), embedding in zip(batch, embeddings, strict=True):
+                future.set_result(embedding)
+
+    def _collect_batch(self) -> list[tuple[str, Future[np.ndarray]]]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_seconds
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except Empty:
+                break
+        return batch
@@ -0,0 +1,48 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+
+import numpy as np
+
+from jesktop.embedders.base import Embedder
+
+
+class CachingEmbedder:
+    """Embedder wrapper that keeps an LRU cache of embeddings keyed by the input text."""
+
+    def __init__(self, embedder: Embedder, max_size: int = 4096) -> None:
+        self.embedder = embedder
+        self.max_size = max_size
+        self._cache: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        self._lock = Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        keys = [sha256(text.encode()).digest() for text in texts]
+        embeddings: dict[bytes, np.ndarray] = {}
+        with self._lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    embeddings[key] = self._cache[key]
+
+        missing = {
+            key: text for key, text in zip(keys, texts, strict=False) if key not in embeddings
+        }
+        if missing:
+            missing_texts = list(missing.values())
+            # A single text goes through embed, so a wrapped BatchingEmbedder can coalesce it
+            if len(missing_texts) == 1:
+                new_embeddings = [self.embedder.embed(missing_texts[0])]
+            else:
+                new_embeddings = self.embedder.embed_batch(missing_texts)
+            with self._lock:
+                for key, embedding in zip(missing, new_embeddings, strict=True):
+                    embeddings[key] = embedding
+                    self._cache[key] = embedding
+                while len(self._cache) > self.max_size:
+                    self._cache.popitem(last=False)
+
+        return [embeddings[key] for key in keys]
@@ -7,9 +7,11 @@ class OpenAIEmbedder:
         self.openai_client = OpenAI(api_key=api_key)
 
     def embed(self, text: str) -> np.ndarray:
-        embedding = (
-            self.openai_client.embeddings.create(input=text, model="text-embedding-3-large")
-            .data[0]
-            .embedding
-        )
-        return np.array(embedding, dtype=np.float32)
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        response = self.openai_client.embeddings.create(input=texts, model="text-embedding-3-large")
+        return [
+            np.array(item.embedding, dtype=np.float32)
+            for item in sorted(response.data, key=lambda item: item.index)
+        ]
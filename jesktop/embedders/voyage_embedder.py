@@ -7,6 +7,8 @@ class VoyageEmbedder:
         self.client = voyageai.Client(api_key=api_key)
 
     def embed(self, text: str) -> np.ndarray:
-        result = self.client.embed(texts=[text], model="voyage-3", input_type="document")
-        embedding = result.embeddings[0]
-        return np.array(embedding, dtype=np.float32)
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        result = self.client.embed(texts=texts, model="voyage-3", input_type="document")
+        return [np.array(embedding, dtype=np.float32) for embedding in result.embeddings]
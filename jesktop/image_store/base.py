@@ -1,15 +1,27 @@
-from typing import List, Optional, Protocol
+from typing import Iterator, List, Optional, Protocol
 
 from jesktop.domain.image import Image
 
 
 class ImageStore(Protocol):
-    """Protocol for image storage implementations."""
+    """Protocol for image storage implementations.
+
+    Ingestion processes notes and their images on thread pools, so implementations must be
+    safe to call from several threads at once.
+    """
 
     def get_image(self, image_id: str) -> Image:
         """Get an image by its ID."""
         ...
 
+    def get_image_mime_type_and_size(self, image_id: str) -> tuple[str, int]:
+        """Get the MIME type and the content size in bytes of an image by its ID."""
+        ...
+
+    def iter_image_content(self, image_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Iterate over the content of an image in chunks of at most chunk_size bytes."""
+        ...
+
     def get_image_id_by_path(self, note_id: str, relative_path: str) -> Optional[str]:
         """Get image ID by note ID and relative path."""
         ...
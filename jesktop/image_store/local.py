@@ -1,13 +1,27 @@
-import json
+import sqlite3
+from contextlib import closing
 from pathlib import Path
-from typing import List, Optional
+from threading import Lock
+from typing import Iterator, List, Optional
 
 from jesktop.domain.image import Image
 from jesktop.image_store.base import ImageStore
 
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id TEXT PRIMARY KEY,
+    note_id TEXT NOT NULL,
+    relative_path TEXT NOT NULL,
+    absolute_path TEXT NOT NULL,
+    mime_type TEXT NOT NULL,
+    content BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_images_note_path ON images (note_id, relative_path);
+"""
+
 
 class LocalImageStore(ImageStore):
-    """Local image store that saves images to a JSON file."""
+    """Local image store that saves images to a SQLite database file."""
 
     def __init__(self, filepath: str | Path | None = None) -> None:
         """Initialize LocalImageStore.
@@ -18,41 +32,104 @@ class LocalImageStore(ImageStore):
                      If not provided, creates empty store in memory only.
         """
         self._filepath = str(filepath) if filepath else None
+        # Ingestion adds images from several threads, and one connection is not safe for that
+        self._lock = Lock()
 
-        # If filepath provided and exists, load from file
+        # Open the database file directly when it exists, so images are read row by row
         if self._filepath and Path(self._filepath).exists():
-            with open(self._filepath, "r") as f:
-                data = json.load(f)
-                self._images = {
-                    image_id: Image(**image_data) for image_id, image_data in data["images"].items()
-                }
+            self._database_path: str | None = self._filepath
+            self._connection = self._connect(self._filepath)
         else:
-            # Create empty store
-            self._images = {}
+            self._database_path = None
+            self._connection = self._connect(":memory:")
+
+    @staticmethod
+    def _connect(database: str) -> sqlite3.Connection:
+        connection = sqlite3.connect(database, check_same_thread=False)
+        connection.executescript(_SCHEMA)
+        return connection
 
     def get_image(self, image_id: str) -> Image:
         """Get an image by its ID."""
-        if image_id not in self._images:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT note_id, relative_path, absolute_path, mime_type, content "
+                "FROM images WHERE id = ?",
+                (image_id,),
+            ).fetchone()
+        if row is None:
+            raise KeyError(f"Image {image_id} not found")
+        note_id, relative_path, absolute_path, mime_type, content = row
+        return Image(
+            id=image_id,
+            note_id=note_id,
+            content=content,
+            mime_type=mime_type,
+            relative_path=relative_path,
+            absolute_path=absolute_path,
+        )
+
+    def get_image_mime_type_and_size(self, image_id: str) -> tuple[str, int]:
+        """Get the MIME type and the content size in bytes of an image by its ID."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT mime_type, length(content) FROM images WHERE id = ?", (image_id,)
+            ).fetchone()
+        if row is None:
             raise KeyError(f"Image {image_id} not found")
-        return self._images[image_id]
+        return row[0], row[1]
+
+    def iter_image_content(self, image_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Iterate over the content of an image, reading the BLOB incrementally."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT rowid FROM images WHERE id = ?", (image_id,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(f"Image {image_id} not found")
+            blob = self._connection.blobopen("images", "content", row[0], readonly=True)
+        # The lock is held per chunk, not across yields, so a slow client blocks nobody
+        with blob:
+            while True:
+                with self._lock:
+                    chunk = blob.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
 
     def get_image_id_by_path(self, note_id: str, relative_path: str) -> Optional[str]:
         """Get image ID by note ID and relative path."""
-        for image in self._images.values():
-            if image.note_id == note_id and image.relative_path == relative_path:
-                return image.id
-        return None
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id FROM images WHERE note_id = ? AND relative_path = ? LIMIT 1",
+                (note_id, relative_path),
+            ).fetchone()
+        return row[0] if row else None
 
     def get_image_ids(self) -> List[str]:
         """Get all image IDs stored in the image store."""
-        return list(self._images.keys())
+        with self._lock:
+            return [row[0] for row in self._connection.execute("SELECT id FROM images")]
 
     def add_image(self, image: Image) -> None:
         """Add an image to the store."""
-        self._images[image.id] = image
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO images "
+                "(id, note_id, relative_path, absolute_path, mime_type, content) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    image.id,
+                    image.note_id,
+                    image.relative_path,
+                    image.absolute_path,
+                    image.mime_type,
+                    image.content,
+                ),
+            )
 
     def save(self, filepath: str | None = None) -> None:
-        """Save the image store to a JSON file.
+        """Save the image store to a SQLite database file.
 
         Args:
             filepath: Path to save to. If not provided, uses the filepath from initialization.
@@ -64,8 +141,15 @@ class LocalImageStore(ImageStore):
             )
 
         save_path = str(save_path)
-        data = {
-            "images": {image_id: image.model_dump() for image_id, image in self._images.items()}
-        }
-        with open(save_path, "w") as f:
-            json.dump(data, f)
+        with self._lock:
+            self._connection.commit()
+            if save_path == self._database_path:
+                return
+
+            with closing(sqlite3.connect(save_path)) as target:
+                self._connection.backup(target)
+
+            if save_path == self._filepath:
+                self._connection.close()
+                self._database_path = save_path
+                self._connection = self._connect(save_path)
@@ -2,8 +2,10 @@
 
 import logging
 import mimetypes
+import os
 import re
-from hashlib import sha256
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import file_digest
 from pathlib import Path
 from typing import List
 from urllib.parse import unquote
@@ -16,43 +18,142 @@ from .path_resolver import PathResolver
 logger = logging.getLogger(__name__)
 
 
+_IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "svg", "webp", "bmp", "tiff"})
+_IMAGE_MIME_TYPES = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif": "image/gif",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".bmp": "image/bmp",
+    ".tiff": "image/tiff",
+}
+
+# The possessive quantifiers only cover character classes that cannot overlap with what
+# follows them, so a failed match is given up without backtracking. Embeds are classified as
+# images or excalidraw drawings by _embed_kind rather than by suffix alternatives.
+_IMAGE_REFERENCE_ALTERNATIVES = (
+    r"!\[(?P<alt>[^\]]*+)\]\((?P<markdown_image>[^\(\)]*+(?:\([^\(\)]*+\)[^\(\)]*+)*+)\)|"
+    r'<img[^>]+src=[\'"](?P<html_image>.*?)[\'"][^>]*>|'  # <img src="path">
+    r"!\[\[(?P<embed>[^\]]++)\]\]"  # ![[content name]]
+)
+# Images and embeds only, for rewriting image references without visiting every wikilink
+_IMAGE_REFERENCE_PATTERN = re.compile(_IMAGE_REFERENCE_ALTERNATIVES)
+# A link target cannot span lines or contain brackets, so an unclosed [[ matches nothing
+_WIKILINK_ALTERNATIVE = (
+    r"\[\[(?P<wikilink>[^\[\]|\n]++)(?:\|[^\[\]\n]*+)?+\]\]"  # [[link name]] or [[link name|text]]
+)
+_WIKILINK_PATTERN = re.compile(_WIKILINK_ALTERNATIVE)
+# One pattern for every reference type, so a note is scanned once
+_CONTENT_PATTERN = re.compile(_IMAGE_REFERENCE_ALTERNATIVES + "|" + _WIKILINK_ALTERNATIVE)
+
+
+def _embed_kind(target: str) -> str:
+    """Classify an embed target as an "excalidraw" drawing, an "image" or a plain "embed"."""
+    stem, _, extension = target.rpartition(".")
+    if not stem:
+        return "embed"
+    if extension == "excalidraw":
+        return "excalidraw"
+    if extension in _IMAGE_EXTENSIONS:
+        return "image"
+    return "embed"
+
+
+def _normalize_image_path(img_path: str) -> str:
+    """Decode percent-escapes and normalise an image path the way str(Path(...)) does."""
+    if "%" in img_path:
+        img_path = unquote(img_path)
+    # Most paths are already normalised, so only build a Path when there is something to collapse
+    if (
+        img_path
+        and img_path != "."
+        and not img_path.startswith("./")
+        and not img_path.endswith(("/", "/."))
+        and "//" not in img_path
+        and "/./" not in img_path
+    ):
+        return img_path
+    return str(Path(img_path))
+
+
 class ContentExtractor:
     """Service for extracting various content types from markdown text."""
 
+    def __init__(self, max_workers: int = 4) -> None:
+        """Initialize ContentExtractor.
+
+        Args:
+            max_workers: Number of images of a note that are processed concurrently
+        """
+        self.max_workers = max_workers
+        # Image hashes keyed by (path, size, mtime_ns), so attachments referenced by many
+        # notes are only hashed once
+        self._image_hashes: dict[tuple[str, int, int], str] = {}
+
     @staticmethod
-    def extract_image_paths(content: str) -> List[str]:
-        """Extract image paths from markdown, HTML, and wikilink content.
+    def scan(content: str) -> dict[str, List[str]]:
+        """Extract all reference types from markdown content in a single pass.
 
         Args:
-            content: String containing markdown or HTML content with image references.
+            content: Markdown content to scan
 
         Returns:
-            List of image paths found in the content.
+            Dictionary with the lists "image_paths", "wikilinks", "embeds" and
+            "excalidraw_refs", in the order they appear in the content.
         """
-        # Pattern matches: ![alt](path), <img src="path">, and ![[image.ext]]
-        image_pattern = (
-            r"!\[([^\]]*)\]\(([^\(\)]*(?:\([^\(\)]*\)[^\(\)]*)*)\)|"  # ![alt](path)
-            r'<img[^>]+src=[\'"](.*?)[\'"][^>]*>|'  # <img src="path">
-            r"\!\[\[([^\]]+\.(?:png|jpg|jpeg|gif|svg|webp|bmp|tiff))\]\]"  # ![[image.ext]]
-        )
-        paths = []
-
-        for match in re.finditer(image_pattern, content):
-            if match.group(2):  # Markdown syntax ![alt](path)
-                img_path = match.group(2)
-            elif match.group(3):  # HTML syntax <img src="path">
-                img_path = match.group(3)
-            elif match.group(4):  # Wikilink syntax ![[image.ext]]
-                img_path = match.group(4)
-            else:
+        image_paths: List[str] = []
+        wikilinks: List[str] = []
+        embeds: List[str] = []
+        excalidraw_refs: List[str] = []
+
+        for match in _CONTENT_PATTERN.finditer(content):
+            # Every alternative of the pattern is a named group
+            kind = match.lastgroup
+            assert kind is not None
+            target = match[kind]
+            if kind == "wikilink":
+                wikilinks.append(target)
                 continue
 
-            img_path = img_path.strip()
+            if kind in ("markdown_image", "html_image") and "[[" in match[0]:
+                # Wikilinks inside an image reference, e.g. in an alt attribute
+                wikilinks.extend(_WIKILINK_PATTERN.findall(match[0]))
+            elif kind == "embed":
+                embeds.append(target)
+                # An embed is also a wikilink to the embedded file
+                link = target.split("|", 1)[0]
+                if link:
+                    wikilinks.append(link)
+                embed_kind = _embed_kind(target)
+                if embed_kind == "excalidraw":
+                    excalidraw_refs.append(target)
+                if embed_kind != "image":
+                    continue
+
+            img_path = target.strip()
+            if img_path and not img_path.startswith(("http://", "https://")):
+                image_paths.append(img_path)
+
+        return {
+            "image_paths": image_paths,
+            "wikilinks": wikilinks,
+            "embeds": embeds,
+            "excalidraw_refs": excalidraw_refs,
+        }
 
-            if not img_path.startswith(("http://", "https://")):
-                paths.append(img_path)
+    @staticmethod
+    def extract_image_paths(content: str) -> List[str]:
+        """Extract image paths from markdown, HTML, and wikilink content.
+
+        Args:
+            content: String containing markdown or HTML content with image references.
 
-        return paths
+        Returns:
+            List of image paths found in the content.
+        """
+        return ContentExtractor.scan(content)["image_paths"]
 
     @staticmethod
     def extract_wikilinks(content: str) -> List[str]:
@@ -66,8 +167,7 @@ class ContentExtractor:
         Returns:
             List of wikilink targets
         """
-        wikilink_pattern = r"\[\[([^\]|]+)(?:\|[^\]]*)?\]\]"
-        return re.findall(wikilink_pattern, content)
+        return ContentExtractor.scan(content)["wikilinks"]
 
     @staticmethod
     def extract_embedded_content(content: str) -> List[str]:
@@ -81,8 +181,7 @@ class ContentExtractor:
         Returns:
             List of embedded content references
         """
-        embed_pattern = r"\!\[\[([^\]]+)\]\]"
-        return re.findall(embed_pattern, content)
+        return ContentExtractor.scan(content)["embeds"]
 
     @staticmethod
     def extract_excalidraw_refs(content: str) -> List[str]:
@@ -96,8 +195,7 @@ class ContentExtractor:
         Returns:
             List of excalidraw file references
         """
-        excalidraw_pattern = r"\!\[\[([^\]]+\.excalidraw)\]\]"
-        return re.findall(excalidraw_pattern, content)
+        return ContentExtractor.scan(content)["excalidraw_refs"]
 
     @staticmethod
     def replace_image_paths(content: str, note_id: str) -> str:
@@ -112,10 +210,13 @@ class ContentExtractor:
         """
 
         def replace_match(match: re.Match[str]) -> str:
-            alt_text = match.group(1) or ""
-            # Check all possible groups for the image path
-            img_path = match.group(2) or match.group(3) or match.group(4) or match.group(5) or ""
-            img_path = img_path.strip()
+            kind = match.lastgroup
+            assert kind is not None
+            if kind == "embed" and _embed_kind(match[kind]) == "embed":
+                return match.group(0)
+
+            alt_text = match.group("alt") or ""
+            img_path = match[kind].strip()
 
             # Skip external URLs
             if img_path.startswith(("http://", "https://")):
@@ -125,25 +226,14 @@ class ContentExtractor:
             if img_path.endswith(".excalidraw"):
                 img_path = img_path + ".png"
 
-            # Clean up the path and ensure correct encoding
-            from pathlib import Path
-            from urllib.parse import unquote
-
-            img_path = str(Path(unquote(img_path)))
+            img_path = _normalize_image_path(img_path)
             api_path = f"/api/images/{note_id}/{img_path}"
             return f"![{alt_text}]({api_path})"
 
-        # Replace both markdown, HTML, and wikilink image syntax
-        pattern = (
-            r"!\[([^\]]*)\]\(([^\(\)]*(?:\([^\(\)]*\)[^\(\)]*)*)\)|"  # ![alt](path)
-            r'<img[^>]+src=[\'"](.*?)[\'"][^>]*>|'  # <img src="path">
-            r"\!\[\[([^\]]+\.excalidraw)\]\]|"  # ![[file.excalidraw]]
-            r"\!\[\[([^\]]+\.(?:png|jpg|jpeg|gif|svg|webp|bmp|tiff))\]\]"  # ![[image.ext]]
-        )
-        return re.sub(pattern, replace_match, content)
+        return _IMAGE_REFERENCE_PATTERN.sub(replace_match, content)
 
-    @staticmethod
     def _process_single_image(
+        self,
         *,
         image_path: Path,
         original_path: str,
@@ -154,17 +244,30 @@ class ContentExtractor:
 
         Common logic for processing both regular images and excalidraw images.
         """
-        # Read image content and calculate hash
-        with open(image_path, "rb") as f:
-            image_content = f.read()
-            image_hash = sha256(image_content).hexdigest()
-
-        # Determine mime type
-        mime_type, _ = mimetypes.guess_type(str(image_path))
+        # Determine mime type before reading, so non-images are never read or hashed
+        mime_type = _IMAGE_MIME_TYPES.get(image_path.suffix.lower())
+        if mime_type is None:
+            mime_type, _ = mimetypes.guess_type(str(image_path))
         if not mime_type or not mime_type.startswith("image/"):
             logger.warning(f"Not an image or unknown type: {image_path}")
             return
 
+        with open(image_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            cache_key = (str(image_path), stat.st_size, stat.st_mtime_ns)
+            image_hash = self._image_hashes.get(cache_key)
+            if image_hash is None:
+                # Hash through a fixed-size buffer so unchanged images are never read into memory
+                image_hash = file_digest(f, "sha256").hexdigest()
+                self._image_hashes[cache_key] = image_hash
+
+            if image_store.get_image_id_by_path(note_id, original_path) == image_hash:
+                logger.debug(f"Image {original_path} unchanged, skipping")
+                return
+
+            f.seek(0)
+            image_content = f.read()
+
         # Store image in database
         image = Image(
             id=image_hash,
@@ -177,6 +280,32 @@ class ContentExtractor:
         image_store.add_image(image)
         logger.info(f"Stored image {original_path} with hash {image_hash}")
 
+    def process_note_attachments(
+        self,
+        *,
+        content: str,
+        note_id: str,
+        file: Path,
+        image_store: ImageStore,
+        path_resolver: PathResolver,
+    ) -> None:
+        """Store the images and excalidraw PNGs referenced by a note, scanning it once."""
+        scanned = self.scan(content)
+        self._store_images(
+            image_paths=scanned["image_paths"],
+            note_id=note_id,
+            file=file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+        self._store_excalidraw_pngs(
+            excalidraw_refs=scanned["excalidraw_refs"],
+            note_id=note_id,
+            file=file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+
     def process_excalidraw_refs_in_note(
         self,
         *,
@@ -187,7 +316,43 @@ class ContentExtractor:
         path_resolver: PathResolver,
     ) -> None:
         """Save corresponding png image for each excalidraw reference in the note."""
-        for excalidraw_ref in self.extract_excalidraw_refs(content):
+        self._store_excalidraw_pngs(
+            excalidraw_refs=self.extract_excalidraw_refs(content),
+            note_id=note_id,
+            file=file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+
+    def process_images_in_note(
+        self,
+        *,
+        content: str,
+        note_id: str,
+        file: Path,
+        image_store: ImageStore,
+        path_resolver: PathResolver,
+    ) -> None:
+        """Store images from markdown in the database without modifying content."""
+        self._store_images(
+            image_paths=self.extract_image_paths(content),
+            note_id=note_id,
+            file=file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+
+    def _store_excalidraw_pngs(
+        self,
+        *,
+        excalidraw_refs: List[str],
+        note_id: str,
+        file: Path,
+        image_store: ImageStore,
+        path_resolver: PathResolver,
+    ) -> None:
+        images = []
+        for excalidraw_ref in excalidraw_refs:
             # Convert excalidraw reference to corresponding PNG path
             png_path = f"{unquote(excalidraw_ref)}.png"
 
@@ -198,24 +363,21 @@ class ContentExtractor:
                 logger.warning(f"Excalidraw PNG not found: {png_path}")
                 continue
 
-            self._process_single_image(
-                image_path=resolved_path,
-                original_path=png_path,
-                note_id=note_id,
-                image_store=image_store,
-            )
+            images.append((resolved_path, png_path))
 
-    def process_images_in_note(
+        self._process_images(images, note_id=note_id, image_store=image_store)
+
+    def _store_images(
         self,
         *,
-        content: str,
+        image_paths: List[str],
         note_id: str,
         file: Path,
         image_store: ImageStore,
         path_resolver: PathResolver,
     ) -> None:
-        """Store images from markdown in the database without modifying content."""
-        for img_path in self.extract_image_paths(content):
+        images = []
+        for img_path in image_paths:
             # Use PathResolver to resolve image path
             resolved_path = path_resolver.resolve_image_path(file, img_path)
 
@@ -223,9 +385,29 @@ class ContentExtractor:
                 logger.warning(f"Image not found: {img_path}")
                 continue
 
+            images.append((resolved_path, str(img_path)))
+
+        self._process_images(images, note_id=note_id, image_store=image_store)
+
+    def _process_images(
+        self, images: List[tuple[Path, str]], *, note_id: str, image_store: ImageStore
+    ) -> None:
+        """Process (image_path, original_path) pairs, reading and hashing them concurrently."""
+
+        def process(image: tuple[Path, str]) -> None:
+            image_path, original_path = image
             self._process_single_image(
-                image_path=resolved_path,
-                original_path=str(img_path),
+                image_path=image_path,
+                original_path=original_path,
                 note_id=note_id,
                 image_store=image_store,
             )
+
+        if len(images) <= 1 or self.max_workers <= 1:
+            for image in images:
+                process(image)
+            return
+
+        # File reads and hashing release the GIL, so images of one note overlap their I/O
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(images))) as executor:
+            list(executor.map(process, images))
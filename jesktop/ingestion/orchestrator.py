@@ -1,10 +1,12 @@
 """Orchestration service for the complete ingestion pipeline."""
 
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import md5, sha256
 from pathlib import Path
 
-from jesktop.domain.note import EmbeddedChunk, Note
+from jesktop.domain.note import Chunk, EmbeddedChunk, Note
 from jesktop.domain.relationships import RelationshipGraph
 from jesktop.embedders.base import Embedder
 from jesktop.image_store.base import ImageStore
@@ -17,6 +19,8 @@ from .text_chunker import TextChunker
 
 logger = logging.getLogger(__name__)
 
+_IMAGE_SUFFIXES = frozenset({".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".bmp", ".tiff"})
+
 
 class IngestionOrchestrator:
     """Orchestrates the complete ingestion pipeline from raw notes to vector database."""
@@ -30,6 +34,9 @@ class IngestionOrchestrator:
         max_tokens: int = 1000,
         overlap: int = 100,
         attachment_folders: list[str] | None = None,
+        max_workers: int = 8,
+        embedding_batch_size: int = 64,
+        embedding_concurrency: int = 4,
     ):
         """Initialize the orchestrator with required services.
 
@@ -40,11 +47,17 @@ class IngestionOrchestrator:
             max_tokens: Maximum tokens per text chunk
             overlap: Token overlap between chunks
             attachment_folders: List of attachment folder names to search
+            max_workers: Number of files processed concurrently
+            embedding_batch_size: Number of chunks embedded per embedder call
+            embedding_concurrency: Number of embedder calls in flight at once
         """
         self.embedder = embedder
         self.vector_db = vector_db
         self.image_store = image_store
         self.attachment_folders = attachment_folders or ["Z - Attachements"]
+        self.max_workers = max_workers
+        self.embedding_batch_size = embedding_batch_size
+        self.embedding_concurrency = embedding_concurrency
 
         self.text_chunker = TextChunker(max_tokens=max_tokens, overlap=overlap)
         self.content_extractor = ContentExtractor()
@@ -57,13 +70,14 @@ class IngestionOrchestrator:
             folder: Path to folder containing markdown files
         """
         all_files = self._get_all_markdown_files_for_ingestion(folder)
-        modified_files = self._get_modified_files(all_files)
+        note_ids = {file: self._generate_note_id(file, folder) for file in all_files}
+        modified_files = self._get_modified_files(note_ids)
 
         logger.info(
             f"Found {len(all_files)} total files, {len(modified_files)} modified since last ingestion"
         )
 
-        current_note_ids = {self._generate_note_id(f, folder) for f in all_files}
+        current_note_ids = set(note_ids.values())
 
         existing_note_ids = self.vector_db.get_all_note_ids()
         deleted_note_ids = existing_note_ids - current_note_ids
@@ -76,14 +90,11 @@ class IngestionOrchestrator:
         if modified_files:
             logger.info(f"Processing {len(modified_files)} modified files...")
 
-            notes, chunks, _ = self._process_modified_files(modified_files, folder)
-
-            for note in notes.values():
-                self.vector_db.delete_chunks_for_note(note.id)
-                self.vector_db.update_note(note)
+            notes, chunks = self._process_modified_files(modified_files, folder)
 
-            for chunk in chunks.values():
-                self.vector_db.add_chunk(chunk)
+            self.vector_db.delete_chunks_for_notes(list(notes))
+            self.vector_db.update_notes(list(notes.values()))
+            self.vector_db.add_chunks(list(chunks.values()))
 
         logger.info("Rebuilding relationship graph...")
         all_notes = self.vector_db.get_notes_by_ids(list(current_note_ids))
@@ -102,7 +113,7 @@ class IngestionOrchestrator:
 
     def _process_modified_files(
         self, files: list[Path], folder: Path
-    ) -> tuple[dict[str, Note], dict[str, EmbeddedChunk], dict[str, str]]:
+    ) -> tuple[dict[str, Note], dict[str, EmbeddedChunk]]:
         """Process file content, images, and metadata for modified files.
 
         Args:
@@ -110,26 +121,77 @@ class IngestionOrchestrator:
             folder: Base folder path
 
         Returns:
-            Tuple of (notes dict, chunks dict, note mapping)
+            Tuple of (notes dict, chunks dict)
         """
         notes = {}
         chunks = {}
-        note_mapping = {}
 
         path_resolver = PathResolver(base_path=folder, attachment_folders=self.attachment_folders)
-        note_mapping = self._get_path_to_file_mapping(files, folder)
 
-        for file in files:
-            note, note_chunks = self._process_file_content(
-                file=file,
-                folder=folder,
-                path_resolver=path_resolver,
+        # Files are independent and mostly wait on disk, so they are processed on a thread
+        # pool. map keeps the results in file order. The workers share the image store, which
+        # therefore has to be thread-safe.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(
+                executor.map(
+                    lambda file: self._process_file_content(
+                        file=file,
+                        folder=folder,
+                        path_resolver=path_resolver,
+                    ),
+                    files,
+                )
             )
+
+        text_chunks = []
+        for note, note_chunks in results:
             notes[note.id] = note
-            for chunk in note_chunks:
-                chunks[chunk.id] = chunk
+            text_chunks.extend(note_chunks)
+
+        # Edits usually touch a few chunks of a note, so chunks whose text is unchanged keep
+        # their stored vector instead of being embedded again
+        stored_vectors = {
+            chunk.text: chunk.vector for chunk in self.vector_db.get_chunks_by_note_ids(list(notes))
+        }
+        reused_chunks = {}
+        new_chunks = []
+        for chunk in text_chunks:
+            vector = stored_vectors.get(chunk.text)
+            if vector is None:
+                new_chunks.append(chunk)
+            else:
+                reused_chunks[chunk.id] = EmbeddedChunk(**chunk.model_dump(), vector=vector)
+        logger.info(f"Embedding {len(new_chunks)} chunks, reusing {len(reused_chunks)} unchanged")
+
+        embedded_chunks = {chunk.id: chunk for chunk in self._embed_chunks(new_chunks)}
+        for chunk in text_chunks:
+            chunks[chunk.id] = reused_chunks.get(chunk.id) or embedded_chunks[chunk.id]
+
+        return notes, chunks
+
+    def _embed_chunks(self, chunks: list[Chunk]) -> list[EmbeddedChunk]:
+        """Embed chunks in batches of embedding_batch_size texts per embedder call.
+
+        Up to embedding_concurrency batches are embedded at once, so the latency of one
+        embedding request overlaps with the others.
+        """
+        batches = [
+            chunks[start : start + self.embedding_batch_size]
+            for start in range(0, len(chunks), self.embedding_batch_size)
+        ]
 
-        return notes, chunks, note_mapping
+        def embed_batch(batch: list[Chunk]) -> list[EmbeddedChunk]:
+            vectors = self.embedder.embed_batch([chunk.text for chunk in batch])
+            return [
+                EmbeddedChunk(**chunk.model_dump(), vector=vector)
+                for chunk, vector in zip(batch, vectors, strict=True)
+            ]
+
+        if len(batches) <= 1 or self.embedding_concurrency <= 1:
+            return [chunk for batch in batches for chunk in embed_batch(batch)]
+
+        with ThreadPoolExecutor(max_workers=self.embedding_concurrency) as executor:
+            return [chunk for embedded in executor.map(embed_batch, batches) for chunk in embedded]
 
     def _extract_and_build_relationships(
         self, notes: dict[str, Note], note_mapping: dict[str, str]
@@ -143,18 +205,22 @@ class IngestionOrchestrator:
         Returns:
             RelationshipGraph with all relationships
         """
+        resolver = ReferenceResolver(note_mapping)
+        # The same attachment is often embedded by many notes, so hash each embed only once
+        embed_hashes: dict[str, str] = {}
         for note in notes.values():
-            wikilinks = self.content_extractor.extract_wikilinks(note.content)
-            resolver = ReferenceResolver(note_mapping)
-            note.outbound_links = resolver.resolve_references(wikilinks)
-
-            embeds = self.content_extractor.extract_embedded_content(note.content)
-            note.embedded_content = [sha256(embed.encode()).hexdigest() for embed in embeds]
+            scanned = self.content_extractor.scan(note.content)
+            note.outbound_links = resolver.resolve_references(scanned["wikilinks"])
 
-        relationship_graph = self.graph_builder.build_relationships(notes)
-        self.graph_builder.update_inbound_links(notes, relationship_graph.relationships)
+            embedded_content = []
+            for embed in scanned["embeds"]:
+                embed_hash = embed_hashes.get(embed)
+                if embed_hash is None:
+                    embed_hash = embed_hashes[embed] = sha256(embed.encode()).hexdigest()
+                embedded_content.append(embed_hash)
+            note.embedded_content = embedded_content
 
-        return relationship_graph
+        return self.graph_builder.build_relationships(notes)
 
     def _process_file_content(
         self,
@@ -162,27 +228,21 @@ class IngestionOrchestrator:
         file: Path,
         folder: Path,
         path_resolver: PathResolver,
-    ) -> tuple[Note, list[EmbeddedChunk]]:
-        """Process a single markdown file's content without relationships."""
+    ) -> tuple[Note, list[Chunk]]:
+        """Process a single markdown file's content without relationships or embeddings."""
         logger.debug(f"Processing {file}")
 
         with open(file, "r", encoding="utf-8") as f:
+            stat = os.fstat(f.fileno())
             content = f.read()
 
         title = file.stem
         if content.startswith("#"):
-            title = content.split("\n")[0].lstrip("#").strip()
+            title = content.partition("\n")[0].lstrip("#").strip()
 
         note_id = self._generate_note_id(file, folder)
 
-        self.content_extractor.process_images_in_note(
-            content=content,
-            note_id=note_id,
-            file=file,
-            image_store=self.image_store,
-            path_resolver=path_resolver,
-        )
-        self.content_extractor.process_excalidraw_refs_in_note(
+        self.content_extractor.process_note_attachments(
             content=content,
             note_id=note_id,
             file=file,
@@ -200,30 +260,24 @@ class IngestionOrchestrator:
             title=title,
             path=str(file),
             content=content,
-            created=file.stat().st_ctime,
-            modified=file.stat().st_mtime,
+            created=stat.st_ctime,
+            modified=stat.st_mtime,
             outbound_links=[],
             embedded_content=[],
             folder_path=folder_path,
         )
 
         chunks = []
-        text_chunks = self.text_chunker.chunk_text(content)
-        current_pos = 0
-
-        for i, chunk_text in enumerate(text_chunks):
-            start_pos = content.find(chunk_text, current_pos)
-            end_pos = start_pos + len(chunk_text)
-            current_pos = end_pos
+        text_chunks = self.text_chunker.chunk_text_with_offsets(content)
 
-            chunk = EmbeddedChunk(
+        for i, (chunk_text, start_pos, end_pos) in enumerate(text_chunks):
+            chunk = Chunk(
                 id=f"{note_id}_{i}",
                 note_id=note_id,
                 title=title,
                 text=chunk_text,
                 start_pos=start_pos,
                 end_pos=end_pos,
-                vector=self.embedder.embed(chunk_text),
             )
             chunks.append(chunk)
 
@@ -241,28 +295,32 @@ class IngestionOrchestrator:
         all_files = list(folder.rglob("*.md"))
         return [f for f in all_files if not f.name.endswith(".excalidraw.md")]
 
-    def _get_modified_files(self, all_files: list[Path]) -> list[Path]:
-        """Filter files for those modified since last ingestion.
+    def _get_modified_files(self, note_ids: dict[Path, str]) -> list[Path]:
+        """Filter files for those modified since their note was last ingested.
 
         Args:
-            all_files: List of all markdown files to check
+            note_ids: Mapping from each markdown file to check to its note ID
 
         Returns:
-            List of files modified since last ingestion
+            List of files that are new or modified since last ingestion
         """
-        existing_note_ids = self.vector_db.get_all_note_ids()
-        last_modified_time = 0.0
-        for note_id in existing_note_ids:
-            note = self.vector_db.get_note(note_id)
-            if note and note.modified > last_modified_time:
-                last_modified_time = note.modified
-
-        return [f for f in all_files if f.stat().st_mtime > last_modified_time]
+        stored_notes = self.vector_db.get_notes_by_ids(list(note_ids.values()))
+        modified_files = []
+        for file, note_id in note_ids.items():
+            note = stored_notes.get(note_id)
+            if note is None or file.stat().st_mtime > note.modified:
+                modified_files.append(file)
+        return modified_files
 
     @staticmethod
     def _generate_note_id(file: Path, base_folder: Path) -> str:
         """Generate a unique note ID from file path."""
-        return md5(str(file.relative_to(base_folder)).encode()).hexdigest()
+        return IngestionOrchestrator._note_id_from_relative_path(str(file.relative_to(base_folder)))
+
+    @staticmethod
+    def _note_id_from_relative_path(relative_path: str) -> str:
+        """Generate the note ID of the file at relative_path."""
+        return md5(relative_path.encode()).hexdigest()
 
     @staticmethod
     def _get_path_to_file_mapping(files: list[Path], folder: Path) -> dict[str, str]:
@@ -278,23 +336,39 @@ class IngestionOrchestrator:
         mapping = {}
 
         for file in files:
-            note_id = IngestionOrchestrator._generate_note_id(file, folder)
+            relative_path = str(file.relative_to(folder))
+            note_id = IngestionOrchestrator._note_id_from_relative_path(relative_path)
             mapping[file.stem] = note_id
             mapping[file.name] = note_id
-            mapping[str(file.relative_to(folder))] = note_id
-
-        image_extensions = {".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".bmp", ".tiff"}
-        for ext in image_extensions:
-            for image_file in folder.rglob(f"*{ext}"):
-                image_id = f"image:{image_file.relative_to(folder)}"
-                mapping[image_file.stem] = image_id
-                mapping[image_file.name] = image_id
-                mapping[str(image_file.relative_to(folder))] = image_id
-
-        for excalidraw_file in folder.rglob("*.excalidraw"):
-            excalidraw_id = f"excalidraw:{excalidraw_file.relative_to(folder)}"
-            mapping[excalidraw_file.stem] = excalidraw_id
-            mapping[excalidraw_file.name] = excalidraw_id
-            mapping[str(excalidraw_file.relative_to(folder))] = excalidraw_id
+            mapping[relative_path] = note_id
+
+        # Walk the folder once and bucket assets by suffix; images are added before excalidraw
+        # drawings so drawings win name collisions, as before. Keys are built from the walk's
+        # strings, so no Path objects are created per asset.
+        image_files: list[tuple[str, str, str]] = []
+        excalidraw_files: list[tuple[str, str, str]] = []
+        for directory, _, filenames in os.walk(folder):
+            relative_directory = os.path.relpath(directory, folder)
+            for filename in filenames:
+                stem, suffix = os.path.splitext(filename)
+                if suffix in _IMAGE_SUFFIXES:
+                    asset_files = image_files
+                elif suffix == ".excalidraw":
+                    asset_files = excalidraw_files
+                else:
+                    continue
+                relative_path = (
+                    filename
+                    if relative_directory == "."
+                    else os.path.join(relative_directory, filename)
+                )
+                asset_files.append((stem, filename, relative_path))
+
+        for prefix, asset_files in (("image", image_files), ("excalidraw", excalidraw_files)):
+            for stem, filename, relative_path in asset_files:
+                asset_id = f"{prefix}:{relative_path}"
+                mapping[stem] = asset_id
+                mapping[filename] = asset_id
+                mapping[relative_path] = asset_id
 
         return mapping
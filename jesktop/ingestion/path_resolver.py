@@ -1,11 +1,18 @@
 """Path resolution for images and attachments."""
 
+import os
+import sys
+from functools import cached_property
 from pathlib import Path
+from threading import Lock
 from typing import Optional
 from urllib.parse import unquote
 
 from loguru import logger
 
+# Paths are compared the way the filesystem does, which ignores case on macOS and Windows
+_CASE_INSENSITIVE = sys.platform in ("darwin", "win32")
+
 
 class PathResolver:
     """Resolve image and attachment paths with clear precedence rules."""
@@ -20,6 +27,8 @@ class PathResolver:
         """
         self.base_path = Path(base_path)
         self.attachment_folders = attachment_folders
+        self._scanned_index: tuple[frozenset[str], frozenset[str]] | None = None
+        self._index_lock = Lock()
 
     def resolve_image_path(self, note_file: Path, image_path: str) -> Optional[Path]:
         """
@@ -38,31 +47,96 @@ class PathResolver:
         Returns:
             Resolved absolute path if found, None otherwise
         """
-        logger.debug(f"Attempting to resolve image path: {image_path}")
+        # Debug messages use loguru's lazy formatting, since this runs for every image reference
+        logger.debug("Attempting to resolve image path: {}", image_path)
 
         # URL decode first - this fixes the main brittleness issue
-        clean_path = unquote(image_path)
-        logger.debug(f"URL decoded path: {clean_path}")
+        clean_path = unquote(image_path) if "%" in image_path else image_path
+        logger.debug("URL decoded path: {}", clean_path)
 
         # Try each resolution strategy in order
-        resolution_strategies = [
-            ("relative to note", self._resolve_relative_to_note),
-            ("in note assets folder", self._resolve_in_note_assets),
-            ("in attachment folders", self._resolve_in_attachments),
-            ("absolute in base", self._resolve_absolute),
-        ]
-
-        for strategy_name, resolver_func in resolution_strategies:
-            candidate = resolver_func(note_file, clean_path)
-            logger.debug(f"Trying {strategy_name}: {candidate}")
+        for strategy_name, resolver_func in self._RESOLUTION_STRATEGIES:
+            candidate = resolver_func(self, note_file, clean_path)
+            logger.debug("Trying {}: {}", strategy_name, candidate)
 
-            if candidate and candidate.exists():
+            if candidate and self._exists(candidate):
                 logger.info(f"Resolved successfully: {image_path} -> {candidate}")
                 return candidate
 
         logger.warning(f"Failed to resolve image path: {image_path}")
         return None
 
+    @staticmethod
+    def _path_key(path: str) -> str:
+        """Normalise a path for comparison with the scanned paths."""
+        return path.lower() if _CASE_INSENSITIVE else path
+
+    @cached_property
+    def _base_prefix(self) -> str:
+        """The prefix shared by the string form of every path under base_path."""
+        base = str(self.base_path)
+        return "" if base == "." else self._path_key(os.path.join(base, ""))
+
+    @property
+    def _index(self) -> tuple[frozenset[str], frozenset[str]]:
+        """All entries under base_path and the symlinks among them, scanned once on first use.
+
+        The resolver is shared by the ingestion threads, so the scan is done under a lock.
+        """
+        index = self._scanned_index
+        if index is None:
+            with self._index_lock:
+                if self._scanned_index is None:
+                    self._scanned_index = self._scan()
+                index = self._scanned_index
+        return index
+
+    def _scan(self) -> tuple[frozenset[str], frozenset[str]]:
+        """Scan base_path for all entries under it and the symlinks among them.
+
+        Symlinks are not followed, so paths through them are checked against the filesystem.
+        """
+        paths = set()
+        symlinks = set()
+        # Entry paths are built like str(Path) would, so they compare equal to candidate paths
+        root = str(self.base_path)
+        directories = ["" if root == "." else root]
+        while directories:
+            directory = directories.pop()
+            try:
+                entries = os.scandir(directory or ".")
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    entry_path = os.path.join(directory, entry.name)
+                    key = self._path_key(entry_path)
+                    paths.add(key)
+                    if entry.is_symlink():
+                        symlinks.add(key)
+                    elif entry.is_dir():
+                        directories.append(entry_path)
+        return frozenset(paths), frozenset(symlinks)
+
+    def _exists(self, path: Path) -> bool:
+        """Check whether path exists, using the scan of base_path instead of a stat call."""
+        key = self._path_key(str(path))
+        prefix = self._base_prefix
+        if not key.startswith(prefix) or (".." in key and ".." in path.parts):
+            return path.exists()
+
+        paths, symlinks = self._index
+        if symlinks:
+            # Paths through a symlink are not in the scan, so the filesystem decides
+            separator = key.find(os.sep, len(prefix))
+            while separator != -1:
+                if key[:separator] in symlinks:
+                    return path.exists()
+                separator = key.find(os.sep, separator + 1)
+            if key in symlinks:
+                return path.exists()
+        return key in paths
+
     def _resolve_relative_to_note(self, note_file: Path, image_path: str) -> Path:
         """Try relative to note file."""
         return note_file.parent / image_path
@@ -74,18 +148,18 @@ class PathResolver:
 
     def _resolve_in_attachments(self, note_file: Path, image_path: str) -> Optional[Path]:
         """Try in configured attachment folders."""
+        assets_folder_name = f"{note_file.stem}.assets"
+        image_name = Path(image_path).name
         for folder in self.attachment_folders:
             # Try direct path in attachment folder
             candidate = self.base_path / folder / image_path
-            if candidate.exists():
+            if self._exists(candidate):
                 return candidate
 
             # Also try in note-specific asset folder within attachments
             # e.g., "Z - Attachements/Note Name.assets/image.png"
-            note_assets_in_attachments = (
-                self.base_path / folder / f"{note_file.stem}.assets" / Path(image_path).name
-            )
-            if note_assets_in_attachments.exists():
+            note_assets_in_attachments = self.base_path / folder / assets_folder_name / image_name
+            if self._exists(note_assets_in_attachments):
                 return note_assets_in_attachments
 
         # Return None if not found in any attachment folder
@@ -95,6 +169,13 @@ class PathResolver:
         """Try absolute path in base directory."""
         return self.base_path / image_path
 
+    _RESOLUTION_STRATEGIES = (
+        ("relative to note", _resolve_relative_to_note),
+        ("in note assets folder", _resolve_in_note_assets),
+        ("in attachment folders", _resolve_in_attachments),
+        ("absolute in base", _resolve_absolute),
+    )
+
     def get_resolution_candidates(self, note_file: Path, image_path: str) -> list[Path]:
         """
         Get all candidate paths for debugging purposes.
@@ -102,7 +183,7 @@ class PathResolver:
         Returns:
             List of all paths that would be tried during resolution
         """
-        clean_path = unquote(image_path)
+        clean_path = unquote(image_path) if "%" in image_path else image_path
 
         candidates = [
             self._resolve_relative_to_note(note_file, clean_path),
@@ -1,31 +1,74 @@
 """Analysis functions for relationship strength and context extraction."""
 
 import re
+from functools import lru_cache
 
 
-def calculate_relationship_strength(source_content: str, target_name: str) -> float:
-    """Calculate relationship strength based on frequency and context.
+@lru_cache(maxsize=4096)
+def _mention_pattern(target_name: str) -> re.Pattern[str]:
+    """Compile the case-insensitive pattern for mentions of a target, once per target."""
+    return re.compile(re.escape(target_name), re.IGNORECASE)
+
+
+_HEADER_PREFIX_PATTERN = re.compile(r" {0,3}#{1,6}[ \t]")
+
+
+def analyze_relationship(
+    source_content: str, target_name: str, context_chars: int = 100
+) -> tuple[float, str]:
+    """Calculate relationship strength and extract context in a single pass over the content.
 
     Args:
         source_content: Full content of the source note
         target_name: Name of the target note
+        context_chars: Number of characters before/after the first mention to include
 
     Returns:
-        Relationship strength between 0.0 and 1.0
+        Tuple of (strength between 0.0 and 1.0, context around the first mention)
     """
-    # Count occurrences of the target in the source
-    occurrences = len(re.findall(re.escape(target_name), source_content, re.IGNORECASE))
+    occurrences = 0
+    header_lines: set[int] = set()
+    first_match = None
+    for match in _mention_pattern(target_name).finditer(source_content):
+        occurrences += 1
+        if first_match is None:
+            first_match = match
+
+        line_start = source_content.rfind("\n", 0, match.start()) + 1
+        header_prefix = _HEADER_PREFIX_PATTERN.match(source_content, line_start)
+        if header_prefix and header_prefix.end() <= match.start():
+            header_lines.add(line_start)
+
+    if first_match is None:
+        return 0.0, ""
+
+    # Base strength on frequency, boosted once per header line mentioning the target
+    strength = min(min(occurrences * 0.3, 1.0) + len(header_lines) * 0.2, 1.0)
+    return strength, _context_around(source_content, first_match, context_chars)
+
+
+def _context_around(content: str, match: re.Match[str], context_chars: int) -> str:
+    """Return the whitespace-collapsed text within context_chars of a match."""
+    start = max(0, match.start() - context_chars)
+    end = min(len(content), match.end() + context_chars)
+
+    context = content[start:end].strip()
+
+    # Clean up context - remove newlines, extra spaces
+    return re.sub(r"\s+", " ", context)
 
-    # Base strength on frequency, capped at 1.0
-    base_strength = min(occurrences * 0.3, 1.0)
 
-    # Boost if mentioned in headers
-    header_mentions = len(
-        re.findall(f"#{1, 6}.*{re.escape(target_name)}", source_content, re.IGNORECASE)
-    )
-    header_boost = header_mentions * 0.2
+def calculate_relationship_strength(source_content: str, target_name: str) -> float:
+    """Calculate relationship strength based on frequency and context.
 
-    return min(base_strength + header_boost, 1.0)
+    Args:
+        source_content: Full content of the source note
+        target_name: Name of the target note
+
+    Returns:
+        Relationship strength between 0.0 and 1.0
+    """
+    return analyze_relationship(source_content, target_name)[0]
 
 
 def extract_relationship_context(content: str, target_name: str, context_chars: int = 100) -> str:
@@ -40,16 +83,8 @@ def extract_relationship_context(content: str, target_name: str, context_chars:
         Context string around the first mention
     """
     # Find first mention of target
-    match = re.search(re.escape(target_name), content, re.IGNORECASE)
+    match = _mention_pattern(target_name).search(content)
     if not match:
         return ""
 
-    start = max(0, match.start() - context_chars)
-    end = min(len(content), match.end() + context_chars)
-
-    context = content[start:end].strip()
-
-    # Clean up context - remove newlines, extra spaces
-    context = re.sub(r"\s+", " ", context)
-
-    return context
+    return _context_around(content, match, context_chars)
@@ -12,12 +12,16 @@ class RelationshipGraphBuilder:
     def build_relationships(self, notes: dict[str, Note]) -> RelationshipGraph:
         """Build relationship graph from processed notes.
 
+        The inbound_links of every note are rebuilt along the way.
+
         Args:
             notes: Dictionary of note ID to Note objects
 
         Returns:
             RelationshipGraph with relationships and note clusters
         """
+        for note in notes.values():
+            note.inbound_links = []
         relationships = self._build_note_relationships(notes)
         note_clusters = self._build_note_clusters(notes)
 
@@ -26,26 +30,8 @@ class RelationshipGraphBuilder:
             note_clusters=note_clusters,
         )
 
-    def update_inbound_links(
-        self, notes: dict[str, Note], relationships: list[NoteRelationship]
-    ) -> None:
-        """Update inbound_links for all notes based on relationships.
-
-        Args:
-            notes: Dictionary of note ID to Note objects
-            relationships: List of relationships to process
-        """
-        # Clear existing inbound links
-        for note in notes.values():
-            note.inbound_links = []
-
-        # Build inbound links from relationships
-        for rel in relationships:
-            if rel.target_note_id in notes:
-                notes[rel.target_note_id].inbound_links.append(rel.source_note_id)
-
     def _build_note_relationships(self, notes: dict[str, Note]) -> list[NoteRelationship]:
-        """Build relationships from outbound links in notes.
+        """Build relationships from outbound links in notes, recording them as inbound links.
 
         Args:
             notes: Dictionary of note ID to Note objects
@@ -56,16 +42,17 @@ class RelationshipGraphBuilder:
         relationships = []
 
         for note in notes.values():
+            # A note that links to the same target several times only scans its content once
+            # for that target
+            analysed: dict[str, tuple[float, str]] = {}
             for target_id in note.outbound_links:
                 # Only create note-to-note relationships, skip asset references
                 if target_id in notes and not target_id.startswith(("image:", "excalidraw:")):
-                    target_note = notes[target_id]
-
-                    # Calculate relationship strength and context
-                    strength = analyzer.calculate_relationship_strength(
-                        note.content, target_note.title
-                    )
-                    context = analyzer.extract_relationship_context(note.content, target_note.title)
+                    if target_id not in analysed:
+                        analysed[target_id] = analyzer.analyze_relationship(
+                            note.content, notes[target_id].title
+                        )
+                    strength, context = analysed[target_id]
 
                     relationship = NoteRelationship(
                         source_note_id=note.id,
@@ -75,6 +62,7 @@ class RelationshipGraphBuilder:
                         strength=strength,
                     )
                     relationships.append(relationship)
+                    notes[target_id].inbound_links.append(note.id)
 
         return relationships
 
@@ -1,6 +1,7 @@
 """Reference resolution for converting note names/paths to note IDs."""
 
 import logging
+from functools import cached_property
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,24 @@ class ReferenceResolver:
                 resolved_ids.append(resolved_id)
         return resolved_ids
 
+    @cached_property
+    def _stem_index(self) -> dict[str, str]:
+        """Map each path stem in the mapping to the ID of the first path with that stem."""
+        index: dict[str, str] = {}
+        for path, note_id in self.note_mapping.items():
+            index.setdefault(Path(path).stem, note_id)
+        return index
+
+    @cached_property
+    def _asset_index(self) -> dict[str, str]:
+        """Map lowercased asset paths and stems to the ID of the first matching asset."""
+        index: dict[str, str] = {}
+        for path, asset_id in self.note_mapping.items():
+            if asset_id.startswith(("image:", "excalidraw:")):
+                index.setdefault(path.lower(), asset_id)
+                index.setdefault(Path(path).stem.lower(), asset_id)
+        return index
+
     def _resolve_single_reference(self, link: str) -> str | None:
         """Resolve a single reference to a note ID or asset reference.
 
@@ -52,18 +71,14 @@ class ReferenceResolver:
             return self.note_mapping[md_link]
 
         # Try as filename stem
-        for path, note_id in self.note_mapping.items():
-            if Path(path).stem == link:
-                return note_id
+        if link in self._stem_index:
+            return self._stem_index[link]
 
         # Check if it might be an image or excalidraw file with different casing
         # or in a different location - be more lenient for assets
-        link_lower = link.lower()
-        for path, asset_id in self.note_mapping.items():
-            if asset_id.startswith(("image:", "excalidraw:")) and (
-                path.lower() == link_lower or Path(path).stem.lower() == link_lower
-            ):
-                return asset_id
+        asset_id = self._asset_index.get(link.lower())
+        if asset_id is not None:
+            return asset_id
 
         logger.warning(f"Could not resolve wikilink: {link}")
         return None
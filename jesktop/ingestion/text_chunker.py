@@ -1,9 +1,14 @@
 """Text chunking service for markdown content."""
 
 import re
+from typing import Iterator
 
 import tiktoken
 
+_HEADER_BOUNDARY_PATTERN = re.compile(r"(?=^#{1,6}\s+.+$)", re.MULTILINE)
+_LIST_ITEM_PATTERN = re.compile(r"^[\s]*[-*+]|\d+\.")
+_SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
 
 class TextChunker:
     """Service for splitting markdown text into chunks while preserving document structure."""
@@ -29,54 +34,95 @@ class TextChunker:
         Returns:
             List of text chunks
         """
-        chunks = []
+        return [chunk for chunk, _, _ in self.chunk_text_with_offsets(text)]
+
+    def chunk_text_with_offsets(self, text: str) -> list[tuple[str, int, int]]:
+        """Split Markdown text into chunks, along with the span of the input each chunk covers.
+
+        Args:
+            text: Input Markdown text
+
+        Returns:
+            List of (chunk, start, end) tuples, where text[start:end] is the part of the input
+            the chunk was built from. The chunk itself joins its pieces with blank lines and
+            may start with overlap context, so it is not always equal to that slice.
+        """
+        chunks: list[tuple[str, int, int]] = []
+        # (offset in the chunk, tokens) of each piece, for computing the overlap context
+        chunk_pieces: list[list[tuple[int, list[int]]]] = []
         current_chunk = ""
+        current_pieces: list[tuple[int, list[int]]] = []
         current_tokens = 0
-
-        # First try splitting on headers
-        for section in self._split_on_headers(text):
-            section_tokens = len(self.enc.encode(section))
-
-            if section_tokens > self.max_tokens:
-                # If section is too large, split on paragraphs
-                for paragraph in self._split_on_paragraphs(section):
-                    para_tokens = len(self.enc.encode(paragraph))
-
-                    if para_tokens > self.max_tokens:
-                        # If paragraph is too large, split on sentences
-                        for sentence in self._split_on_sentences(paragraph):
-                            current_chunk, current_tokens, new_chunks = self._process_text_chunk(
-                                text=sentence,
-                                current_chunk=current_chunk,
-                                current_tokens=current_tokens,
-                            )
-                            chunks.extend(new_chunks)
-                    else:
-                        current_chunk, current_tokens, new_chunks = self._process_text_chunk(
-                            text=paragraph,
-                            current_chunk=current_chunk,
-                            current_tokens=current_tokens,
-                        )
-                        chunks.extend(new_chunks)
+        current_start = current_end = 0
+
+        for piece, start, end, piece_tokens in self._iter_pieces(text):
+            if current_tokens + len(piece_tokens) > self.max_tokens:
+                if current_chunk:
+                    chunks.append((current_chunk, current_start, current_end))
+                    chunk_pieces.append(current_pieces)
+                current_chunk = piece
+                current_pieces = [(0, piece_tokens)]
+                current_tokens = len(piece_tokens)
+                current_start = start
             else:
-                current_chunk, current_tokens, new_chunks = self._process_text_chunk(
-                    text=section,
-                    current_chunk=current_chunk,
-                    current_tokens=current_tokens,
-                )
-                chunks.extend(new_chunks)
+                if current_chunk:
+                    current_chunk += "\n\n"
+                else:
+                    current_start = start
+                current_pieces.append((len(current_chunk), piece_tokens))
+                current_chunk += piece
+                current_tokens += len(piece_tokens)
+            current_end = end
 
         # Add the last chunk if it exists
         if current_chunk:
-            chunks.append(current_chunk.strip())
+            chunks.append((current_chunk, current_start, current_end))
+            chunk_pieces.append(current_pieces)
+
+        return self._add_chunk_overlap(chunks, chunk_pieces)
 
-        return self._add_chunk_overlap(chunks)
+    def _iter_pieces(self, text: str) -> Iterator[tuple[str, int, int, list[int]]]:
+        """Yield (piece, start, end, token ids) for the pieces chunks are assembled from.
+
+        Text is split on headers first; sections that are too large are split on
+        paragraphs, and paragraphs that are too large are split on sentences.
+        """
+        for section, start, end in self._locate(self._split_on_headers(text), text, 0):
+            section_tokens = self.enc.encode(section)
+            if len(section_tokens) <= self.max_tokens:
+                yield section, start, end, section_tokens
+                continue
+
+            paragraphs = self._split_on_paragraphs(section)
+            for paragraph, para_start, para_end in self._locate(paragraphs, section, start):
+                para_tokens = self.enc.encode(paragraph)
+                if len(para_tokens) <= self.max_tokens:
+                    yield paragraph, para_start, para_end, para_tokens
+                    continue
+
+                sentences = self._split_on_sentences(paragraph)
+                for sentence, sent_start, sent_end in self._locate(
+                    sentences, paragraph, para_start
+                ):
+                    yield sentence, sent_start, sent_end, self.enc.encode(sentence)
+
+    @staticmethod
+    def _locate(pieces: list[str], parent: str, offset: int) -> Iterator[tuple[str, int, int]]:
+        """Yield each piece with its span, given that pieces are ordered substrings of parent.
+
+        Only whitespace separates consecutive pieces, so searching from the end of the
+        previous piece finds each one without rescanning the parent.
+        """
+        cursor = 0
+        for piece in pieces:
+            index = parent.find(piece, cursor)
+            cursor = index + len(piece)
+            yield piece, offset + index, offset + cursor
 
     @staticmethod
     def _split_on_headers(text: str) -> list[str]:
         """Split Markdown text into sections based on headers."""
-        header_pattern = r"^#{1,6}\s+.+$"
-        sections = re.split(f"(?={header_pattern})", text, flags=re.MULTILINE)
+        sections = _HEADER_BOUNDARY_PATTERN.split(text)
         return [s.strip() for s in sections if s.strip()]
 
     @staticmethod
@@ -88,7 +134,7 @@ class TextChunker:
 
         for i, line in enumerate(lines):
             is_empty = not line.strip()
-            next_is_list = i < len(lines) - 1 and bool(re.match(r"^[\s]*[-*+]|\d+\.", lines[i + 1]))
+            next_is_list = i < len(lines) - 1 and bool(_LIST_ITEM_PATTERN.match(lines[i + 1]))
 
             current_part.append(line)
 
@@ -106,44 +152,42 @@ class TextChunker:
     @staticmethod
     def _split_on_sentences(text: str) -> list[str]:
         """Split text into sentences."""
-        sentences = re.split(r"(?<=[.!?])\s+", text)
+        sentences = _SENTENCE_BOUNDARY_PATTERN.split(text)
         return [s.strip() for s in sentences if s.strip()]
 
-    def _process_text_chunk(
-        self, *, text: str, current_chunk: str, current_tokens: int
-    ) -> tuple[str, int, list[str]]:
-        """Process a text chunk and return updated state."""
-        text = text.strip()
-        if not text:
-            return current_chunk, current_tokens, []
-
-        text_tokens = len(self.enc.encode(text))
-        chunks = []
-
-        if current_tokens + text_tokens > self.max_tokens:
-            if current_chunk:
-                chunks.append(current_chunk.strip())
-            current_chunk = text
-            current_tokens = text_tokens
-        else:
-            if current_chunk:
-                current_chunk += "\n\n"
-            current_chunk += text
-            current_tokens += text_tokens
-
-        return current_chunk, current_tokens, chunks
-
-    def _add_chunk_overlap(self, chunks: list[str]) -> list[str]:
+    def _add_chunk_overlap(
+        self,
+        chunks: list[tuple[str, int, int]],
+        chunk_pieces: list[list[tuple[int, list[int]]]],
+    ) -> list[tuple[str, int, int]]:
         """Add overlapping context between chunks."""
         if self.overlap <= 0 or len(chunks) <= 1:
             return chunks
 
-        overlapped_chunks = []
-        for i, chunk in enumerate(chunks):
-            if i > 0:
-                prev_chunk = chunks[i - 1]
-                prev_tokens = self.enc.encode(prev_chunk)[-self.overlap :]
-                context = self.enc.decode(prev_tokens)
-                chunk = f"Previous context: {context}\n\n{chunk}"
-            overlapped_chunks.append(chunk)
+        overlapped_chunks = [chunks[0]]
+        for i in range(1, len(chunks)):
+            chunk, start, end = chunks[i]
+            context = self._overlap_context(chunks[i - 1][0], chunk_pieces[i - 1])
+            overlapped_chunks.append((f"Previous context: {context}\n\n{chunk}", start, end))
         return overlapped_chunks
+
+    def _overlap_context(self, chunk: str, pieces: list[tuple[int, list[int]]]) -> str:
+        """Decode the last overlap tokens of a chunk.
+
+        Pieces are joined by blank lines, after which the tokenizer always starts a new token,
+        so the tokens of a suffix starting at a piece are the tail of the tokens of the whole
+        chunk. The last piece's own tokens are used when there are enough of them; otherwise
+        only the shortest suffix with enough tokens is encoded.
+        """
+        last_tokens = pieces[-1][1]
+        if len(last_tokens) >= self.overlap:
+            return self.enc.decode(last_tokens[-self.overlap :])
+
+        tail_tokens = 0
+        for offset, piece_tokens in reversed(pieces[1:]):
+            tail_tokens += len(piece_tokens)
+            if tail_tokens >= self.overlap:
+                tokens = self.enc.encode(chunk[offset:])
+                if len(tokens) >= self.overlap:
+                    return self.enc.decode(tokens[-self.overlap :])
+        return self.enc.decode(self.enc.encode(chunk)[-self.overlap :])
@@ -1,11 +1,11 @@
-from typing import Generator, List, Protocol
+from typing import AsyncGenerator, List, Protocol
 
 from jesktop.llms.schemas import LLMMessage
 
 
 class LLMChat(Protocol):
-    def chat(self, messages: List[LLMMessage]) -> LLMMessage: ...
+    async def chat(self, messages: List[LLMMessage]) -> LLMMessage: ...
 
-    def chat_stream(self, messages: List[LLMMessage]) -> Generator[LLMMessage, None, None]:
+    def chat_stream(self, messages: List[LLMMessage]) -> AsyncGenerator[LLMMessage, None]:
         """Stream chat completions, yielding only new content chunks."""
         ...
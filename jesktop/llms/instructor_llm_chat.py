@@ -1,31 +1,38 @@
-from typing import Generator, List
+from typing import AsyncGenerator, List
 
-from instructor import Instructor
+from instructor import AsyncInstructor
 
 from jesktop.llms.schemas import AssistantResponse, LLMMessage
 
 
 class InstructorLLMChat:
-    def __init__(self, instructor: Instructor) -> None:
+    def __init__(self, instructor: AsyncInstructor) -> None:
         self.instructor = instructor
 
-    def chat(self, messages: List[LLMMessage]) -> LLMMessage:
-        response = self.instructor.chat.completions.create(
+    async def chat(self, messages: List[LLMMessage]) -> LLMMessage:
+        response = await self.instructor.chat.completions.create(
             model="claude-3-5-sonnet-20241022",
-            messages=[m.model_dump() for m in messages],  # type: ignore
+            messages=[m.as_dict for m in messages],  # type: ignore
             response_model=AssistantResponse,
         )
         return LLMMessage(role="assistant", content=response.answer)
 
-    def chat_stream(self, messages: List[LLMMessage]) -> Generator[LLMMessage, None, None]:
+    async def chat_stream(self, messages: List[LLMMessage]) -> AsyncGenerator[LLMMessage, None]:
         """Stream chat completions, yielding only new content chunks."""
         responses = self.instructor.chat.completions.create_partial(
             model="claude-3-5-sonnet-20241022",
             max_tokens=2048,
-            messages=[m.model_dump() for m in messages],  # type: ignore
+            messages=[m.as_dict for m in messages],  # type: ignore
             response_model=AssistantResponse,
             stream=True,
         )
 
-        for response in responses:
-            yield LLMMessage(role="assistant", content=response.answer)
+        # Partial responses render the whole answer so far, of which only the new end is sent
+        sent = ""
+        async for response in responses:
+            if response.no_information is None:
+                continue
+            answer = response.answer
+            if len(answer) > len(sent) and answer.startswith(sent):
+                yield LLMMessage(role="assistant", content=answer[len(sent) :])
+                sent = answer
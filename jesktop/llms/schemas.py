@@ -1,4 +1,4 @@
-from typing import List, Literal, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -7,6 +7,11 @@ class LLMMessage(BaseModel):
     role: Literal["user", "assistant", "system"]
     content: str
 
+    @property
+    def as_dict(self) -> Dict[str, str]:
+        """The message as the role/content dict sent to the LLM API, without model_dump."""
+        return {"role": self.role, "content": self.content}
+
 
 class NoteReference(BaseModel):
     """A reference to a note that was used to answer the question"""
@@ -19,6 +24,8 @@ class NoteReference(BaseModel):
 class RelevantNote(BaseModel):
     """Detailed information from a relevant note"""
 
+    # The reference comes first, so it is complete by the time streamed text is rendered under it
+    note_reference: NoteReference = Field(..., description="Reference to the relevant note")
     text: str = Field(
         ...,
         description=(
@@ -26,7 +33,6 @@ class RelevantNote(BaseModel):
             "Quotes should be in markdown blockquotes `>`"
         ),
     )
-    note_reference: NoteReference = Field(..., description="Reference to the relevant note")
 
     @property
     def answer(self) -> str:
@@ -44,6 +50,10 @@ class RelevantNote(BaseModel):
 class AssistantResponse(BaseModel):
     """Structured response from the assistant following the prompt template"""
 
+    # Decided first, so a streamed answer does not start rendering sections it will not have
+    no_information: bool = Field(
+        description="True if no relevant information was found in the notes"
+    )
     summary: str = Field(
         ..., description="A detailed summary of the information that was found in the notes."
     )
@@ -53,9 +63,6 @@ class AssistantResponse(BaseModel):
     additional_context: Optional[str] = Field(
         description="Related information or connections between notes"
     )
-    no_information: bool = Field(
-        description="True if no relevant information was found in the notes"
-    )
 
     @property
     def answer(self) -> str:
@@ -0,0 +1,101 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Awaitable, Callable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from jesktop.embedders.base import Embedder
+from jesktop.llms.schemas import LLMMessage
+
+
+class SemanticResponseCache:
+    """Cache of streamed answers, reused for questions similar to a recently answered one.
+
+    Questions are compared by the cosine similarity of their embeddings. A cached answer is
+    reused when the similarity is at least threshold and it is younger than ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        embedder: Embedder,
+        *,
+        threshold: float = 0.95,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+    ) -> None:
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._keys: list[NDArray[np.float32]] = []
+        self._entries: list[tuple[float, list[LLMMessage]]] = []
+        self._matrix: NDArray[np.float32] | None = None
+
+    async def stream(
+        self,
+        question: str,
+        answer: Callable[[], Awaitable[AsyncGenerator[LLMMessage, None]]],
+    ) -> AsyncGenerator[LLMMessage, None]:
+        """Stream the answer to question, replaying the cached answer of a similar question.
+
+        Args:
+            question: The question as asked by the user
+            answer: Called on a cache miss to start streaming a new answer
+        """
+        key = await self._embed(question)
+        cached = self._lookup(key)
+        if cached is not None:
+            for message in cached:
+                yield message
+            return
+
+        # Only a stream that completes is cached
+        streamed = []
+        async for message in await answer():
+            streamed.append(message)
+            yield message
+        self._store(key, streamed)
+
+    async def _embed(self, question: str) -> NDArray[np.float32]:
+        """Embed the question off the event loop and normalise it to unit length."""
+        vector = await asyncio.to_thread(self.embedder.embed, question)
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _lookup(self, key: NDArray[np.float32]) -> list[LLMMessage] | None:
+        """Return the cached stream of the most similar fresh question, if it is similar enough."""
+        self._expire()
+        if not self._keys:
+            return None
+
+        if self._matrix is None:
+            self._matrix = np.stack(self._keys)
+        similarities = self._matrix @ key
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.threshold:
+            return None
+        return self._entries[best][1]
+
+    def _store(self, key: NDArray[np.float32], messages: list[LLMMessage]) -> None:
+        """Cache a response stream, evicting the oldest entries beyond max_entries."""
+        if self.max_entries <= 0:
+            return
+        self._keys.append(key)
+        self._entries.append((time.monotonic(), messages))
+        if len(self._keys) > self.max_entries:
+            del self._keys[: -self.max_entries]
+            del self._entries[: -self.max_entries]
+        self._matrix = None
+
+    def _expire(self) -> None:
+        """Drop entries older than ttl_seconds; entries are kept in insertion order."""
+        deadline = time.monotonic() - self.ttl_seconds
+        expired = 0
+        while expired < len(self._entries) and self._entries[expired][0] < deadline:
+            expired += 1
+        if expired:
+            del self._keys[:expired]
+            del self._entries[:expired]
+            self._matrix = None
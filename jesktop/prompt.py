@@ -1,5 +1,7 @@
 from typing import List
 
+import numpy as np
+
 from jesktop.domain.note import Chunk
 from jesktop.embedders.base import Embedder
 from jesktop.vector_dbs.base import VectorDB
@@ -15,10 +17,12 @@ Answer: """
 
 
 def get_context(relevant_notes: List[Chunk]) -> str:
-    context = ""
-    for note in relevant_notes:
-        context += f"Note ID: {note.note_id}\nTitle: {note.title}\nContent: {note.text}\n\n"
-    return context
+    return "".join(
+        [
+            f"Note ID: {note.note_id}\nTitle: {note.title}\nContent: {note.text}\n\n"
+            for note in relevant_notes
+        ]
+    )
 
 
 def get_prompt(
@@ -28,8 +32,24 @@ def get_prompt(
     vector_db: VectorDB,
     closest: int,
 ) -> str:
-    input_vector = embedder.embed("\n".join(input_texts))
-    closest_chunks = vector_db.get_closest_chunks(input_vector, closest=closest)
+    if len(input_texts) > 1:
+        input_vectors = np.stack(embedder.embed_batch(input_texts))
+        chunks_per_text = vector_db.get_closest_chunks_batch(input_vectors, closest=closest)
+        closest_chunks = _merge_closest_chunks(chunks_per_text[::-1], closest)
+    else:
+        input_vector = embedder.embed(input_texts[0])
+        closest_chunks = vector_db.get_closest_chunks(input_vector, closest=closest)
     context = get_context(relevant_notes=closest_chunks)
     prompt = PROMPT_TEMPLATE.format(question=input_texts[-1], context=context)
     return prompt
+
+
+def _merge_closest_chunks(chunks_per_text: List[List[Chunk]], closest: int) -> List[Chunk]:
+    """Interleave the ranked chunks of several texts, skipping duplicates, up to closest."""
+    merged: dict[str, Chunk] = {}
+    for rank_chunks in zip(*chunks_per_text, strict=True):
+        for chunk in rank_chunks:
+            merged.setdefault(chunk.id, chunk)
+            if len(merged) == closest:
+                return list(merged.values())
+    return list(merged.values())
@@ -11,6 +11,12 @@ class VectorDB(Protocol):
         """Get the closest chunks to an input vector."""
         ...
 
+    def get_closest_chunks_batch(
+        self, input_vectors: np.ndarray, closest: int
+    ) -> List[List[Chunk]]:
+        """Get the closest chunks to each row of a matrix of input vectors."""
+        ...
+
     def get_note(self, note_id: str) -> Note | None:
         """Get a note by its ID."""
         ...
@@ -43,6 +49,10 @@ class VectorDB(Protocol):
         """Add an embedded chunk to the database."""
         ...
 
+    def add_chunks(self, chunks: List[EmbeddedChunk]) -> None:
+        """Add multiple embedded chunks to the database."""
+        ...
+
     def update_relationship_graph(self, relationship_graph: RelationshipGraph) -> None:
         """Update the relationship graph."""
         ...
@@ -51,6 +61,10 @@ class VectorDB(Protocol):
         """Add a new note or update an existing one."""
         ...
 
+    def update_notes(self, notes: List[Note]) -> None:
+        """Add or update multiple notes."""
+        ...
+
     def delete_note(self, note_id: str) -> None:
         """Delete a note and all its associated chunks."""
         ...
@@ -59,6 +73,10 @@ class VectorDB(Protocol):
         """Delete all chunks associated with a note."""
         ...
 
+    def delete_chunks_for_notes(self, note_ids: List[str]) -> None:
+        """Delete all chunks associated with any of the given notes."""
+        ...
+
     def get_all_note_ids(self) -> set[str]:
         """Get all note IDs in the database."""
         ...
@@ -74,6 +92,17 @@ class VectorDB(Protocol):
         """
         ...
 
+    def get_chunks_by_note_ids(self, note_ids: list[str]) -> list[EmbeddedChunk]:
+        """Get the embedded chunks of multiple notes.
+
+        Args:
+            note_ids: List of note IDs whose chunks to retrieve
+
+        Returns:
+            List of embedded chunks belonging to any of the notes
+        """
+        ...
+
     def clear(self) -> None:
         """Clear all data from the database."""
         ...
@@ -1,17 +1,40 @@
-import json
-from collections import deque
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
 
 import numpy as np
+import orjson
+from numpy.typing import NDArray
 
 from jesktop.domain.note import Chunk, EmbeddedChunk, Note
 from jesktop.domain.relationships import RelationshipGraph
 from jesktop.vector_dbs.base import VectorDB
 
 
+def _vectors_path(filepath: str) -> Path:
+    """Path of the .npy file holding the chunk vectors of the database at filepath."""
+    return Path(filepath).with_suffix(".npy")
+
+
+class _TitleIndex:
+    """Lookup tables from the titles and file stems of notes to the first note having them."""
+
+    def __init__(self, notes: Iterable[Note]) -> None:
+        self.exact: dict[str, Note] = {}
+        self.lowered: dict[str, Note] = {}
+        self.normalized: dict[str, Note] = {}
+        # Stems are matched against two keys, so the note position decides between them
+        self.stems: dict[str, tuple[int, Note]] = {}
+        for position, note in enumerate(notes):
+            self.exact.setdefault(note.title, note)
+            if note.title:
+                lowered = note.title.lower()
+                self.lowered.setdefault(lowered, note)
+                self.normalized.setdefault(lowered.replace(" ", "_"), note)
+            self.stems.setdefault(Path(note.path).stem.lower(), (position, note))
+
+
 class LocalVectorDB(VectorDB):
-    """Local vector database that stores embeddings in a JSON file."""
+    """Local vector database that stores notes in a JSON file and embeddings in a .npy file."""
 
     def __init__(self, filepath: str | Path | None = None) -> None:
         """Initialize LocalVectorDB.
@@ -22,13 +45,21 @@ class LocalVectorDB(VectorDB):
                      If not provided, creates empty database in memory only.
         """
         self._filepath = str(filepath) if filepath else None
+        # Lookup tables derived from the notes and relationships, built on first use
+        self._title_index: _TitleIndex | None = None
+        self._relationship_contexts: dict[tuple[str, str], str] | None = None
+        self._link_graph: tuple[dict[str, tuple[str, ...]], dict[str, list[str]]] | None = None
 
         if self._filepath and Path(self._filepath).exists():
-            with open(self._filepath, "r") as f:
-                data = json.load(f)
+            with open(self._filepath, "rb") as f:
+                data = orjson.loads(f.read())
             self._notes = {
                 note_id: Note(**note_data) for note_id, note_data in data["notes"].items()
             }
+            vectors = self._load_vectors(data["chunks"])
+            if vectors is not None:
+                for chunk_data, vector in zip(data["chunks"].values(), vectors, strict=True):
+                    chunk_data["vector"] = vector
             self._embedded_chunks = {
                 chunk_id: EmbeddedChunk(**chunk_data)
                 for chunk_id, chunk_data in data["chunks"].items()
@@ -40,6 +71,13 @@ class LocalVectorDB(VectorDB):
             self._notes = {}
             self._embedded_chunks = {}
             self._relationship_graph = RelationshipGraph()
+            vectors = None
+
+        self._invalidate_search_index()
+        self._invalidate_note_indexes()
+        self._index_chunks_by_note()
+        if vectors is not None:
+            self._set_search_index(list(self._embedded_chunks.values()), vectors)
 
     @classmethod
     def from_data(
@@ -60,25 +98,87 @@ class LocalVectorDB(VectorDB):
         """
         instance = cls(filepath=None)
         instance._notes = notes or {}
+        instance._invalidate_note_indexes()
         instance._embedded_chunks = embedded_chunks or {}
+        instance._index_chunks_by_note()
+        instance._invalidate_search_index()
         instance._relationship_graph = relationship_graph or RelationshipGraph()
         return instance
 
+    def _invalidate_search_index(self) -> None:
+        """Mark the search index as stale so it is rebuilt on the next search."""
+        self._matrix: NDArray[np.float32] | None = None
+        self._inverse_norms: NDArray[np.float32] = np.empty(0, dtype=np.float32)
+        self._chunk_index: list[EmbeddedChunk] = []
+
+    def _index_chunks_by_note(self) -> None:
+        """Rebuild the mapping from note IDs to the IDs of their chunks."""
+        self._chunks_by_note: dict[str, set[str]] = {}
+        for chunk_id, chunk in self._embedded_chunks.items():
+            self._chunks_by_note.setdefault(chunk.note_id, set()).add(chunk_id)
+
+    def _build_search_index(self) -> NDArray[np.float32]:
+        """Stack all chunk vectors into one matrix with rows aligned to _chunk_index."""
+        chunks = list(self._embedded_chunks.values())
+        if chunks:
+            vectors = np.stack([chunk.vector for chunk in chunks])
+            matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+        return self._set_search_index(chunks, matrix)
+
+    def _set_search_index(
+        self, chunks: list[EmbeddedChunk], matrix: NDArray[np.float32]
+    ) -> NDArray[np.float32]:
+        """Use matrix as the search index, where row i holds the vector of chunks[i]."""
+        # Point each chunk at its matrix row so the matrix is the only copy of the vectors
+        for chunk, row in zip(chunks, matrix, strict=True):
+            chunk.vector = row
+        self._chunk_index = chunks
+        self._matrix = matrix
+        norms = np.linalg.norm(matrix, axis=1)
+        norms[norms == 0] = 1.0
+        self._inverse_norms = 1.0 / norms
+        return matrix
+
+    def _load_vectors(self, chunks_data: dict[str, dict]) -> NDArray[np.float32] | None:
+        """Load the chunk vectors stored next to the database file.
+
+        Returns None for databases that store vectors inline in the JSON file.
+        """
+        if any("vector" in chunk_data for chunk_data in chunks_data.values()):
+            return None
+        if not chunks_data:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.load(_vectors_path(str(self._filepath)))
+
     def get_closest_chunks(self, input_vector: np.ndarray, closest: int) -> List[Chunk]:
         """Get the closest chunks to an input vector."""
-        input_vector = np.array(input_vector)
-
-        similarities = []
-        for chunk in self._embedded_chunks.values():
-            chunk_vector = np.array(chunk.vector)
-            similarity = np.dot(input_vector, chunk_vector) / (
-                np.linalg.norm(input_vector) * np.linalg.norm(chunk_vector)
-            )
-            similarities.append((similarity, chunk))
-
-        similarities.sort(key=lambda x: x[0], reverse=True)
+        return self.get_closest_chunks_batch(np.asarray(input_vector)[np.newaxis], closest)[0]
+
+    def get_closest_chunks_batch(
+        self, input_vectors: np.ndarray, closest: int
+    ) -> List[List[Chunk]]:
+        """Get the closest chunks to each row of input_vectors, with one matrix product."""
+        input_vectors = np.asarray(input_vectors, dtype=np.float32)
+        matrix = self._matrix if self._matrix is not None else self._build_search_index()
+        if not self._chunk_index or closest <= 0:
+            return [[] for _ in range(len(input_vectors))]
+
+        # The query norm is the same for every row, so it does not affect the ranking
+        similarities = (input_vectors @ matrix.T) * self._inverse_norms
+        return [self._top_chunks(row, closest) for row in similarities]
+
+    def _top_chunks(self, similarities: NDArray[np.float32], closest: int) -> List[Chunk]:
+        """Get the closest chunks given the similarity of the query to every chunk."""
+        if closest < len(similarities):
+            candidates = np.argpartition(-similarities, closest - 1)[:closest]
+        else:
+            candidates = np.arange(len(similarities))
+        top_indices = candidates[np.lexsort((candidates, -similarities[candidates]))]
+        # Stored chunks were validated when added, so the results skip validation
         return [
-            Chunk(
+            Chunk.model_construct(
                 id=chunk.id,
                 note_id=chunk.note_id,
                 title=chunk.title,
@@ -86,7 +186,7 @@ class LocalVectorDB(VectorDB):
                 start_pos=chunk.start_pos,
                 end_pos=chunk.end_pos,
             )
-            for _, chunk in similarities[:closest]
+            for chunk in (self._chunk_index[i] for i in top_indices)
         ]
 
     def get_note(self, note_id: str) -> Note | None:
@@ -98,26 +198,19 @@ class LocalVectorDB(VectorDB):
         if note_id not in self._notes:
             return []
 
-        visited = set()
+        successors, _ = self._get_link_graph()
+        visited = {note_id}
         related_notes = []
-        queue = deque([(note_id, 0)])  # (note_id, depth)
-        visited.add(note_id)
-
-        while queue:
-            current_id, depth = queue.popleft()
-
-            if depth > 0:  # Don't include the source note itself
-                if current_id in self._notes:
-                    related_notes.append(self._notes[current_id])
-
-            if depth < max_depth:
-                # Add outbound links
-                current_note = self._notes.get(current_id)
-                if current_note:
-                    for linked_id in current_note.outbound_links + current_note.inbound_links:
-                        if linked_id not in visited:
-                            visited.add(linked_id)
-                            queue.append((linked_id, depth + 1))
+        frontier = [note_id]
+        for _ in range(max_depth):
+            next_frontier = []
+            for current_id in frontier:
+                for linked_id in successors[current_id]:
+                    if linked_id not in visited:
+                        visited.add(linked_id)
+                        related_notes.append(self._notes[linked_id])
+                        next_frontier.append(linked_id)
+            frontier = next_frontier
 
         return related_notes
 
@@ -140,33 +233,75 @@ class LocalVectorDB(VectorDB):
         if source_id == target_id:
             return [source_id]
 
-        visited = set()
-        queue = deque([(source_id, [source_id])])  # (note_id, path)
-        visited.add(source_id)
-
-        while queue:
-            current_id, path = queue.popleft()
-            current_note = self._notes.get(current_id)
-
-            if current_note:
-                # Check all connected notes
-                connected_ids = current_note.outbound_links + current_note.inbound_links
-                for connected_id in connected_ids:
-                    if connected_id == target_id:
-                        return path + [connected_id]
-
-                    if connected_id not in visited and connected_id in self._notes:
-                        visited.add(connected_id)
-                        queue.append((connected_id, path + [connected_id]))
+        # Search from both ends, mapping each reached note to the note it was reached from
+        successors, predecessors = self._get_link_graph()
+        forward: dict[str, str | None] = {source_id: None}
+        backward: dict[str, str | None] = {target_id: None}
+        forward_frontier = [source_id]
+        backward_frontier = [target_id]
+
+        while forward_frontier and backward_frontier:
+            if len(forward_frontier) <= len(backward_frontier):
+                forward_frontier, meeting_id = self._expand_frontier(
+                    forward_frontier, successors, parents=forward, other_parents=backward
+                )
+            else:
+                backward_frontier, meeting_id = self._expand_frontier(
+                    backward_frontier, predecessors, parents=backward, other_parents=forward
+                )
+            if meeting_id is not None:
+                return self._join_paths(meeting_id, forward, backward)
 
         return []
 
+    @staticmethod
+    def _expand_frontier(
+        frontier: list[str],
+        adjacency: Mapping[str, Sequence[str]],
+        *,
+        parents: dict[str, str | None],
+        other_parents: dict[str, str | None],
+    ) -> tuple[list[str], str | None]:
+        """Advance a search by one level, stopping at a note the other search has reached.
+
+        Returns the next frontier and the note where the searches met, if they did.
+        """
+        next_frontier: list[str] = []
+        for note_id in frontier:
+            for linked_id in adjacency.get(note_id, ()):
+                if linked_id not in parents:
+                    parents[linked_id] = note_id
+                    if linked_id in other_parents:
+                        return next_frontier, linked_id
+                    next_frontier.append(linked_id)
+        return next_frontier, None
+
+    @staticmethod
+    def _join_paths(
+        meeting_id: str, forward: dict[str, str | None], backward: dict[str, str | None]
+    ) -> List[str]:
+        """Build the source-to-target path through the note where the searches met."""
+        path = []
+        note_id: str | None = meeting_id
+        while note_id is not None:
+            path.append(note_id)
+            note_id = forward[note_id]
+        path.reverse()
+        note_id = backward[meeting_id]
+        while note_id is not None:
+            path.append(note_id)
+            note_id = backward[note_id]
+        return path
+
     def get_relationship_context(self, source_id: str, target_id: str) -> str:
         """Get the context text for a relationship between two notes."""
-        for rel in self._relationship_graph.relationships:
-            if rel.source_note_id == source_id and rel.target_note_id == target_id:
-                return rel.context
-        return ""
+        contexts = self._relationship_contexts
+        if contexts is None:
+            contexts = {}
+            for rel in self._relationship_graph.relationships:
+                contexts.setdefault((rel.source_note_id, rel.target_note_id), rel.context)
+            self._relationship_contexts = contexts
+        return contexts.get((source_id, target_id), "")
 
     def find_note_by_title(self, title: str) -> Note | None:
         """Find note by title, supporting fuzzy matching.
@@ -185,36 +320,57 @@ class LocalVectorDB(VectorDB):
                 return result
         return None
 
+    def _get_title_index(self) -> "_TitleIndex":
+        """Get the title lookup tables, building them from the notes if they are stale."""
+        if self._title_index is None:
+            self._title_index = _TitleIndex(self._notes.values())
+        return self._title_index
+
+    def _get_link_graph(self) -> tuple[dict[str, tuple[str, ...]], dict[str, list[str]]]:
+        """Get the notes each note links to or from, and the reverse of that mapping."""
+        if self._link_graph is None:
+            successors: dict[str, tuple[str, ...]] = {}
+            predecessors: dict[str, list[str]] = {}
+            for note_id, note in self._notes.items():
+                linked_ids = tuple(
+                    dict.fromkeys(
+                        linked_id
+                        for linked_id in note.outbound_links + note.inbound_links
+                        if linked_id in self._notes
+                    )
+                )
+                successors[note_id] = linked_ids
+                for linked_id in linked_ids:
+                    predecessors.setdefault(linked_id, []).append(note_id)
+            self._link_graph = (successors, predecessors)
+        return self._link_graph
+
+    def _invalidate_note_indexes(self) -> None:
+        """Mark the lookup tables derived from the notes and relationships as stale."""
+        self._title_index = None
+        self._relationship_contexts = None
+        self._link_graph = None
+
     def _match_exact_title(self, title: str) -> Note | None:
         """Match exact title including empty strings."""
-        for note in self._notes.values():
-            if note.title == title:
-                return note
-        return None
+        return self._get_title_index().exact.get(title)
 
     def _match_case_insensitive_title(self, title: str) -> Note | None:
         """Match title case insensitively."""
-        for note in self._notes.values():
-            if note.title and note.title.lower() == title.lower():
-                return note
-        return None
+        return self._get_title_index().lowered.get(title.lower())
 
     def _match_normalized_title(self, title: str) -> Note | None:
         """Match title with space/underscore normalization."""
-        normalized_title = title.lower().replace(" ", "_")
-        for note in self._notes.values():
-            if note.title and note.title.lower().replace(" ", "_") == normalized_title:
-                return note
-        return None
+        return self._get_title_index().normalized.get(title.lower().replace(" ", "_"))
 
     def _match_stem(self, title: str) -> Note | None:
         """Match by file stem (filename without extension)."""
-        normalized_title = title.lower().replace(" ", "_")
-        for note in self._notes.values():
-            note_stem = Path(note.path).stem
-            if note_stem.lower() in (normalized_title, title.lower()):
-                return note
-        return None
+        stems = self._get_title_index().stems
+        matches = [
+            stems[key] for key in (title.lower().replace(" ", "_"), title.lower()) if key in stems
+        ]
+        # Return the note that comes first, as a scan over the notes would
+        return min(matches, key=lambda match: match[0])[1] if matches else None
 
     def _match_substring_title(self, title: str) -> Note | None:
         """Match by substring in title."""
@@ -224,7 +380,7 @@ class LocalVectorDB(VectorDB):
         return None
 
     def save(self, filepath: str | None = None) -> None:
-        """Save the vector database to a JSON file.
+        """Save the vector database to a JSON file, with chunk vectors in a .npy file next to it.
 
         Args:
             filepath: Path to save to. If not provided, uses the filepath from initialization.
@@ -236,43 +392,72 @@ class LocalVectorDB(VectorDB):
             )
 
         save_path = str(save_path)
+        matrix = self._matrix if self._matrix is not None else self._build_search_index()
         data = {
             "notes": {note_id: note.model_dump() for note_id, note in self._notes.items()},
             "chunks": {
-                chunk_id: chunk.model_dump() for chunk_id, chunk in self._embedded_chunks.items()
+                chunk_id: chunk.model_dump(exclude={"vector"})
+                for chunk_id, chunk in self._embedded_chunks.items()
             },
             "relationships": self._relationship_graph.model_dump(),
         }
-        with open(save_path, "w") as f:
-            json.dump(data, f)
+        with open(save_path, "wb") as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        np.save(_vectors_path(save_path), matrix)
 
     def add_chunk(self, chunk: EmbeddedChunk) -> None:
         """Add an embedded chunk to the database."""
-        self._embedded_chunks[chunk.id] = chunk
+        self.add_chunks([chunk])
+
+    def add_chunks(self, chunks: List[EmbeddedChunk]) -> None:
+        """Add multiple embedded chunks to the database."""
+        for chunk in chunks:
+            replaced = self._embedded_chunks.get(chunk.id)
+            if replaced is not None and replaced.note_id != chunk.note_id:
+                self._chunks_by_note[replaced.note_id].discard(chunk.id)
+            self._embedded_chunks[chunk.id] = chunk
+            self._chunks_by_note.setdefault(chunk.note_id, set()).add(chunk.id)
+        if chunks:
+            self._invalidate_search_index()
 
     def update_relationship_graph(self, relationship_graph: RelationshipGraph) -> None:
         """Update the relationship graph."""
         self._relationship_graph = relationship_graph
+        # Building relationships updates the links of the notes in place
+        self._invalidate_note_indexes()
 
     def update_note(self, note: Note) -> None:
         """Add a new note or update an existing one."""
         self._notes[note.id] = note
+        self._invalidate_note_indexes()
+
+    def update_notes(self, notes: List[Note]) -> None:
+        """Add or update multiple notes."""
+        for note in notes:
+            self._notes[note.id] = note
+        if notes:
+            self._invalidate_note_indexes()
 
     def delete_note(self, note_id: str) -> None:
         """Delete a note and all its associated chunks."""
         if note_id in self._notes:
             del self._notes[note_id]
+            self._invalidate_note_indexes()
         self.delete_chunks_for_note(note_id)
 
     def delete_chunks_for_note(self, note_id: str) -> None:
         """Delete all chunks associated with a note."""
-        chunks_to_delete = [
-            chunk_id
-            for chunk_id, chunk in self._embedded_chunks.items()
-            if chunk.note_id == note_id
-        ]
-        for chunk_id in chunks_to_delete:
-            del self._embedded_chunks[chunk_id]
+        self.delete_chunks_for_notes([note_id])
+
+    def delete_chunks_for_notes(self, note_ids: List[str]) -> None:
+        """Delete all chunks associated with any of the given notes."""
+        deleted = False
+        for note_id in note_ids:
+            for chunk_id in self._chunks_by_note.pop(note_id, ()):
+                del self._embedded_chunks[chunk_id]
+                deleted = True
+        if deleted:
+            self._invalidate_search_index()
 
     def get_all_note_ids(self) -> set[str]:
         """Get all note IDs in the database."""
@@ -289,8 +474,26 @@ class LocalVectorDB(VectorDB):
         """
         return {note_id: self._notes[note_id] for note_id in note_ids if note_id in self._notes}
 
+    def get_chunks_by_note_ids(self, note_ids: list[str]) -> list[EmbeddedChunk]:
+        """Get the embedded chunks of multiple notes.
+
+        Args:
+            note_ids: List of note IDs whose chunks to retrieve
+
+        Returns:
+            List of embedded chunks belonging to any of the notes
+        """
+        return [
+            self._embedded_chunks[chunk_id]
+            for note_id in dict.fromkeys(note_ids)
+            for chunk_id in self._chunks_by_note.get(note_id, ())
+        ]
+
     def clear(self) -> None:
         """Clear all data from the database."""
         self._notes.clear()
+        self._invalidate_note_indexes()
         self._embedded_chunks.clear()
+        self._chunks_by_note.clear()
         self._relationship_graph = RelationshipGraph()
+        self._invalidate_search_index()
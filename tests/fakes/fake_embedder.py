@@ -8,3 +8,6 @@ class FakeEmbedder(Embedder):
 
     def embed(self, text: str) -> np.ndarray:
         return np.zeros(10)
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        return [self.embed(text) for text in texts]
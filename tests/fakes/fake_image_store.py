@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 from jesktop.domain.image import Image
 from jesktop.image_store.base import ImageStore
@@ -16,6 +16,17 @@ class FakeImageStore(ImageStore):
             raise KeyError(f"Image {image_id} not found")
         return self._images[image_id]
 
+    def get_image_mime_type_and_size(self, image_id: str) -> tuple[str, int]:
+        """Get the MIME type and the content size in bytes of an image by its ID."""
+        image = self.get_image(image_id)
+        return image.mime_type, len(image.content)
+
+    def iter_image_content(self, image_id: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Iterate over the content of an image in chunks."""
+        content = self.get_image(image_id).content
+        for start in range(0, len(content), chunk_size):
+            yield content[start : start + chunk_size]
+
     def get_image_id_by_path(self, note_id: str, relative_path: str) -> Optional[str]:
         """Get image ID by note ID and relative path."""
         for image in self._images.values():
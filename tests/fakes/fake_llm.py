@@ -1,4 +1,4 @@
-from typing import Generator, List
+from typing import AsyncGenerator, List
 
 from jesktop.llms.base import LLMChat
 from jesktop.llms.schemas import LLMMessage
@@ -10,10 +10,10 @@ class FakeLLMChat(LLMChat):
     def __init__(self, responses: List[str]) -> None:
         self.responses = responses
 
-    def chat(self, messages: List[LLMMessage]) -> LLMMessage:
+    async def chat(self, messages: List[LLMMessage]) -> LLMMessage:
         return LLMMessage(role="assistant", content=self.responses[0])
 
-    def chat_stream(self, messages: List[LLMMessage]) -> Generator[LLMMessage, None, None]:
+    async def chat_stream(self, messages: List[LLMMessage]) -> AsyncGenerator[LLMMessage, None]:
         """Stream chat completions, yielding only new content chunks."""
         for response in self.responses:
             yield LLMMessage(role="assistant", content=response)
@@ -37,6 +37,11 @@ class FakeVectorDB(VectorDB):
             ),
         ]
 
+    def get_closest_chunks_batch(
+        self, input_vectors: np.ndarray, closest: int
+    ) -> List[List[Chunk]]:
+        return [self.get_closest_chunks(vector, closest) for vector in input_vectors]
+
     def get_note(self, note_id: str) -> Note | None:
         try:
             return self._notes[note_id]
@@ -66,6 +71,11 @@ class FakeVectorDB(VectorDB):
         """Add or update a note in the fake database."""
         self._notes[note.id] = note
 
+    def update_notes(self, notes: list[Note]) -> None:
+        """Add or update notes in the fake database."""
+        for note in notes:
+            self._notes[note.id] = note
+
     def delete_note(self, note_id: str) -> None:
         """Delete a note from the fake database."""
         if note_id in self._notes:
@@ -75,10 +85,22 @@ class FakeVectorDB(VectorDB):
         """Delete chunks for a note (no-op in fake)."""
         pass
 
+    def delete_chunks_for_notes(self, note_ids: list[str]) -> None:
+        """Delete chunks for notes (no-op in fake)."""
+        pass
+
+    def get_chunks_by_note_ids(self, note_ids: list[str]) -> list["EmbeddedChunk"]:
+        """Get stored chunks (none in fake)."""
+        return []
+
     def add_chunk(self, chunk: "EmbeddedChunk") -> None:
         """Add a chunk (no-op in fake)."""
         pass
 
+    def add_chunks(self, chunks: list["EmbeddedChunk"]) -> None:
+        """Add chunks (no-op in fake)."""
+        pass
+
     def update_relationship_graph(self, relationship_graph: "RelationshipGraph") -> None:
         """Update relationship graph (no-op in fake)."""
         pass
@@ -1,6 +1,21 @@
+import asyncio
 import base64
+from typing import AsyncGenerator
 
+import numpy as np
 from fastapi.testclient import TestClient
+from starlette.responses import PlainTextResponse
+from starlette.types import Receive, Scope, Send
+
+from jesktop.api import create_app
+from jesktop.api.auth import StaticExemptSessionMiddleware
+from jesktop.api.endpoints import stream_response
+from jesktop.domain.image import Image
+from jesktop.image_store.base import ImageStore
+from jesktop.llms.schemas import LLMMessage
+from jesktop.llms.semantic_response_cache import SemanticResponseCache
+from jesktop.vector_dbs.base import VectorDB
+from tests.fakes import FakeLLMChat
 
 
 def login_user(
@@ -89,6 +104,47 @@ def test_image_endpoint_returns_image(test_client: TestClient) -> None:
     # The endpoint returns base64 encoded content
     assert base64.b64decode(response.content) == b"fake image data"
     assert response.headers["cache-control"] == "public, max-age=31536000"
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+def test_image_endpoint_streams_large_images(
+    test_client: TestClient, fake_image_store: ImageStore
+) -> None:
+    """Test that large images are streamed with their Content-Length."""
+    content = bytes(range(256)) * 8192
+    fake_image_store.add_image(
+        Image(
+            id="large",
+            note_id="note1",
+            content=content,
+            mime_type="image/png",
+            relative_path="large.png",
+            absolute_path="/test/large.png",
+        )
+    )
+    login_user(test_client)
+
+    response = test_client.get("/api/images/note1/large.png")
+
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-length"] == str(len(content))
+
+
+def test_image_endpoint_not_modified(test_client: TestClient) -> None:
+    """Test that image endpoint returns 304 when the client already has the image."""
+    login_user(test_client)
+    response = test_client.get("/api/images/note1/test.png")
+    etag = response.headers["etag"]
+    assert etag == '"image1"'
+
+    response = test_client.get("/api/images/note1/test.png", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    response = test_client.get("/api/images/note1/test.png", headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200
 
 
 def test_unauthorized_access_without_credentials(test_client: TestClient) -> None:
@@ -213,3 +269,123 @@ def test_notes_search_endpoint_unauthorized(test_client: TestClient) -> None:
     # Test without authentication
     response = test_client.get("/api/notes/search?title=Test Note 1")
     assert response.status_code == 401
+
+
+def test_health_endpoint_does_not_require_authentication(test_client: TestClient) -> None:
+    """Test that the health check stays public while API endpoints require a session."""
+    response = test_client.get("/health")
+    assert response.status_code == 200
+    assert response.json() == {"status": "healthy"}
+
+
+def test_session_middleware_skips_static_paths() -> None:
+    """Test that static asset requests bypass session handling."""
+    has_session: dict[str, bool] = {}
+
+    async def app(scope: Scope, receive: Receive, send: Send) -> None:
+        has_session[scope["path"]] = "session" in scope
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    client = TestClient(StaticExemptSessionMiddleware(app, secret_key="secret"))
+    client.get("/static/assets/app.js")
+    client.get("/note/note1")
+
+    assert has_session == {"/static/assets/app.js": False, "/note/note1": True}
+
+
+def test_stream_response_coalesces_quick_events() -> None:
+    """Test that events produced in quick succession are written together."""
+
+    async def answers():
+        for content in ["first", "second\nline", "third"]:
+            yield LLMMessage(role="assistant", content=content)
+
+    async def collect() -> list[bytes]:
+        return [chunk async for chunk in stream_response(answers())]
+
+    chunks = asyncio.run(collect())
+
+    assert len(chunks) < 4
+    assert b"".join(chunks) == (
+        b"data: first\n\ndata: second\ndata: line\n\ndata: third\n\nevent: done\ndata:\n\n"
+    )
+
+
+class RecordingLLMChat(FakeLLMChat):
+    """Fake LLM chat that records the prompts it streams answers to."""
+
+    def __init__(self, responses: list[str]) -> None:
+        super().__init__(responses)
+        self.prompts: list[str] = []
+
+    async def chat_stream(self, messages: list[LLMMessage]) -> AsyncGenerator[LLMMessage, None]:
+        self.prompts.append(messages[-1].content)
+        async for message in super().chat_stream(messages):
+            yield message
+
+
+class QuestionEmbedder:
+    """Embedder that gives each distinct text its own orthogonal vector."""
+
+    def __init__(self) -> None:
+        self.texts: list[str] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        if text not in self.texts:
+            self.texts.append(text)
+        vector = np.zeros(8)
+        vector[self.texts.index(text)] = 1.0
+        return vector
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+
+def test_chat_endpoint_caches_answers_by_question(
+    fake_vector_db: VectorDB, fake_image_store: ImageStore
+) -> None:
+    """Test that cached answers are keyed on the question, not on the prompt with its notes."""
+    chatbot = RecordingLLMChat(responses=["answer"])
+    embedder = QuestionEmbedder()
+    client = TestClient(
+        create_app(
+            vector_db=fake_vector_db,
+            embedder=embedder,
+            chatbot=chatbot,
+            image_store=fake_image_store,
+            response_cache=SemanticResponseCache(embedder),
+        )
+    )
+    login_user(client)
+
+    for question in ["bananas", "emojis", "bananas"]:
+        response = client.get(f"/chat?message={question}")
+        assert response.text == "data: answer\n\nevent: done\ndata:\n\n"
+
+    prompts = chatbot.prompts
+    assert len(prompts) == 2, "The repeated question should be answered from the cache"
+    assert prompts[0].endswith("Question: bananas\n\nAnswer: ")
+    assert prompts[1].endswith("Question: emojis\n\nAnswer: ")
+
+
+def test_stream_response_flushes_buffered_events_while_waiting() -> None:
+    """Test that a buffered event is sent before a slow next event arrives."""
+    second_sent = asyncio.Event()
+
+    async def answers():
+        yield LLMMessage(role="assistant", content="first")
+        await asyncio.sleep(0.5)
+        second_sent.set()
+        yield LLMMessage(role="assistant", content="second")
+
+    async def first_chunk() -> tuple[bytes, bool]:
+        stream = stream_response(answers())
+        chunk = await anext(stream)
+        arrived_before_second = not second_sent.is_set()
+        await stream.aclose()
+        return chunk, arrived_before_second
+
+    chunk, arrived_before_second = asyncio.run(first_chunk())
+
+    assert chunk == b"data: first\n\n"
+    assert arrived_before_second
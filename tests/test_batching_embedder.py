@@ -0,0 +1,72 @@
+"""Tests for BatchingEmbedder functionality."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from jesktop.embedders.batching_embedder import BatchingEmbedder
+from jesktop.embedders.caching_embedder import CachingEmbedder
+
+
+class RecordingBatchEmbedder:
+    """Embedder that records the batches it receives and embeds text as its length."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        self.batches.append(texts)
+        time.sleep(0.01)
+        return [np.array([len(text)], dtype=np.float32) for text in texts]
+
+
+class FailingEmbedder:
+    """Embedder whose batch requests always fail."""
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        raise RuntimeError("Embedding service unavailable")
+
+
+def test_concurrent_embeds_are_batched() -> None:
+    """Test that concurrent embed calls share batched requests and get their own results."""
+    inner = RecordingBatchEmbedder()
+    embedder = BatchingEmbedder(inner, max_batch_size=8, max_wait_seconds=0.1)
+    texts = ["a" * length for length in range(1, 9)]
+
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        embeddings = list(executor.map(embedder.embed, texts))
+
+    assert [embedding[0] for embedding in embeddings] == [len(text) for text in texts], (
+        "Each caller should receive the embedding of its own text"
+    )
+    assert len(inner.batches) < len(texts), "Concurrent calls should be combined into batches"
+    assert all(len(batch) <= 8 for batch in inner.batches), "Batches should respect max size"
+
+
+def test_embed_propagates_errors() -> None:
+    """Test that errors from the wrapped embedder are raised to the caller."""
+    embedder = BatchingEmbedder(FailingEmbedder())
+
+    with pytest.raises(RuntimeError, match="Embedding service unavailable"):
+        embedder.embed("text")
+
+
+def test_cached_concurrent_embeds_are_batched() -> None:
+    """Test that concurrent cache misses through CachingEmbedder still share batches."""
+    inner = RecordingBatchEmbedder()
+    embedder = CachingEmbedder(BatchingEmbedder(inner, max_batch_size=8, max_wait_seconds=0.1))
+    texts = ["a" * length for length in range(1, 9)]
+
+    with ThreadPoolExecutor(max_workers=len(texts)) as executor:
+        embeddings = list(executor.map(embedder.embed, texts))
+
+    assert [embedding[0] for embedding in embeddings] == [len(text) for text in texts]
+    assert len(inner.batches) < len(texts), "Concurrent calls should be combined into batches"
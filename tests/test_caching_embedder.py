@@ -0,0 +1,64 @@
+"""Tests for CachingEmbedder functionality."""
+
+import numpy as np
+
+from jesktop.embedders.caching_embedder import CachingEmbedder
+
+
+class CountingEmbedder:
+    """Embedder that records every text it is asked to embed."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        embeddings = []
+        for text in texts:
+            self.calls.append(text)
+            embeddings.append(np.full(3, len(self.calls), dtype=np.float32))
+        return embeddings
+
+
+def test_repeated_text_is_embedded_once() -> None:
+    """Test that repeated texts are served from the cache."""
+    inner = CountingEmbedder()
+    embedder = CachingEmbedder(inner)
+
+    first = embedder.embed("hello")
+    second = embedder.embed("hello")
+
+    assert inner.calls == ["hello"], "Wrapped embedder should only be called once"
+    np.testing.assert_array_equal(first, second)
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    """Test that the cache evicts the least recently used text when full."""
+    inner = CountingEmbedder()
+    embedder = CachingEmbedder(inner, max_size=2)
+
+    embedder.embed("a")
+    embedder.embed("b")
+    embedder.embed("a")
+    embedder.embed("c")
+
+    embedder.embed("a")
+    assert inner.calls == ["a", "b", "c"], "Recently used text should still be cached"
+
+    embedder.embed("b")
+    assert inner.calls == ["a", "b", "c", "b"], "Least recently used text should be evicted"
+
+
+def test_embed_batch_only_embeds_missing_texts() -> None:
+    """Test that batch embedding reuses cached texts and embeds duplicates once."""
+    inner = CountingEmbedder()
+    embedder = CachingEmbedder(inner)
+    cached = embedder.embed("a")
+
+    embeddings = embedder.embed_batch(["a", "b", "b"])
+
+    assert inner.calls == ["a", "b"], "Only uncached texts should reach the wrapped embedder"
+    np.testing.assert_array_equal(embeddings[0], cached)
+    np.testing.assert_array_equal(embeddings[1], embeddings[2])
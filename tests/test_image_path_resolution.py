@@ -5,6 +5,8 @@ from typing import Any
 
 import pytest
 
+import jesktop.ingestion.content_extractor as content_extractor_module
+from jesktop.domain.image import Image
 from jesktop.image_store.local import LocalImageStore
 from jesktop.ingestion.content_extractor import ContentExtractor
 from jesktop.ingestion.path_resolver import PathResolver
@@ -195,3 +197,78 @@ def test_multiple_image_reference_patterns(
         f"Expected: {list(expected_images.keys())}, "
         f"Got: {[image_store.get_image(img_id).relative_path for img_id in stored_image_ids]}"
     )
+
+
+def test_unchanged_image_is_not_stored_again(
+    test_note_file: Path,
+    url_encoded_note_content: str,
+    url_encoded_test_image: Path,
+    path_resolver: PathResolver,
+    monkeypatch: Any,
+) -> None:
+    """Test that re-processing a note skips images already stored with the same content."""
+    monkeypatch.chdir(test_note_file.parent.parent.parent)
+    image_store = LocalImageStore()
+    content_extractor = ContentExtractor()
+
+    def process_note() -> None:
+        content_extractor.process_images_in_note(
+            content=url_encoded_note_content,
+            note_id="test_note_id",
+            file=test_note_file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+
+    process_note()
+    stored_images: list[str] = []
+    original_add_image = image_store.add_image
+
+    def recording_add_image(image: Image) -> None:
+        stored_images.append(image.id)
+        original_add_image(image)
+
+    monkeypatch.setattr(image_store, "add_image", recording_add_image)
+
+    process_note()
+    assert stored_images == [], "Unchanged image should not be stored again"
+
+    url_encoded_test_image.write_bytes(b"updated image content")
+    process_note()
+    assert len(stored_images) == 1, "Changed image should be stored"
+    assert image_store.get_image(stored_images[0]).content == b"updated image content"
+
+
+@pytest.mark.usefixtures("url_encoded_test_image")
+def test_image_shared_by_notes_is_hashed_once(
+    test_note_file: Path,
+    url_encoded_note_content: str,
+    path_resolver: PathResolver,
+    monkeypatch: Any,
+) -> None:
+    """Test that an attachment referenced by several notes is only hashed once."""
+    monkeypatch.chdir(test_note_file.parent.parent.parent)
+    hashed_files: list[str] = []
+    original_file_digest = content_extractor_module.file_digest
+
+    def counting_file_digest(f: Any, digest: str) -> Any:
+        hashed_files.append(f.name)
+        return original_file_digest(f, digest)
+
+    monkeypatch.setattr(content_extractor_module, "file_digest", counting_file_digest)
+
+    image_store = LocalImageStore()
+    content_extractor = ContentExtractor()
+    for note_id in ["first_note", "second_note"]:
+        content_extractor.process_images_in_note(
+            content=url_encoded_note_content,
+            note_id=note_id,
+            file=test_note_file,
+            image_store=image_store,
+            path_resolver=path_resolver,
+        )
+
+    assert len(hashed_files) == 1
+    assert image_store.get_image_id_by_path(
+        "second_note", "Z%20-%20Attachements/Test%20Note.assets/Image.png"
+    )
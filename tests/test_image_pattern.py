@@ -64,3 +64,28 @@ def test_extract_image_paths(description, content, expected_paths):  # noqa
     extractor = ContentExtractor()
     paths = extractor.extract_image_paths(content)
     assert paths == expected_paths, f"Failed test case: {description}"
+
+
+@pytest.mark.parametrize(
+    "content,expected_paths,expected_excalidraw_refs",
+    [
+        ("![[photo.png]]", ["photo.png"], []),
+        ("![[photo.png|300]]", [], []),
+        ("![[.png]]", [], []),
+        ("![[drawing.excalidraw]]", [], ["drawing.excalidraw"]),
+        ("![[Some Note]]", [], []),
+    ],
+)
+def test_embed_classification(content, expected_paths, expected_excalidraw_refs):  # noqa
+    scanned = ContentExtractor.scan(content)
+    assert scanned["image_paths"] == expected_paths
+    assert scanned["excalidraw_refs"] == expected_excalidraw_refs
+    assert scanned["embeds"] == [content[3:-2]]
+
+
+def test_replace_image_paths_rewrites_only_image_references() -> None:
+    content = "[[Note]] ![[Other Note]] ![[photo.png]] ![[drawing.excalidraw]] ![alt](a%20b.png)"
+    assert ContentExtractor.replace_image_paths(content, "note1") == (
+        "[[Note]] ![[Other Note]] ![](/api/images/note1/photo.png) "
+        "![](/api/images/note1/drawing.excalidraw.png) ![alt](/api/images/note1/a b.png)"
+    )
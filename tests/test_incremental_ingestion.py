@@ -1,11 +1,14 @@
 """Tests for incremental ingestion functionality using fakes and fixtures."""
 
+import os
 import time
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from jesktop.ingestion.orchestrator import IngestionOrchestrator
+from jesktop.vector_dbs.local_db import LocalVectorDB
 from tests.fakes import FakeEmbedder, FakeImageStore, FakeVectorDB
 
 
@@ -140,6 +143,25 @@ def test_incremental_ingestion_new_file(
     assert "new note" in new_note.content
 
 
+def test_incremental_ingestion_new_file_with_old_mtime(
+    orchestrator_with_fakes: IngestionOrchestrator, notes_with_content: Path
+) -> None:
+    """Test that a new file is ingested even if it is older than the ingested notes."""
+    orchestrator = orchestrator_with_fakes
+    orchestrator.ingest(notes_with_content)
+
+    copied_note = notes_with_content / "copied.md"
+    copied_note.write_text("# Copied\nA note copied in with its original timestamp.")
+    os.utime(copied_note, (1_000_000, 1_000_000))
+
+    assert orchestrator._get_modified_files(
+        {
+            file: orchestrator._generate_note_id(file, notes_with_content)
+            for file in notes_with_content.rglob("*.md")
+        }
+    ) == [copied_note]
+
+
 def test_incremental_ingestion_deleted_file(
     orchestrator_with_fakes: IngestionOrchestrator, notes_with_content: Path
 ) -> None:
@@ -248,3 +270,79 @@ def test_note_timestamp_consistency(
         assert note.modified > 0
         # For new files, created and modified should be similar
         assert abs(note.created - note.modified) < 1.0  # Within 1 second
+
+
+def test_chunks_are_embedded_in_batches(notes_with_content: Path) -> None:
+    """Test that chunks from all modified files are embedded in batched embedder calls."""
+    batch_sizes: list[int] = []
+
+    class RecordingEmbedder(FakeEmbedder):
+        def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+            batch_sizes.append(len(texts))
+            return super().embed_batch(texts)
+
+    orchestrator = IngestionOrchestrator(
+        embedder=RecordingEmbedder(),
+        vector_db=FakeVectorDB({}),
+        image_store=FakeImageStore(),
+        max_tokens=100,
+        overlap=10,
+        embedding_batch_size=2,
+    )
+    orchestrator.ingest(notes_with_content)
+
+    assert sorted(batch_sizes) == [1, 2]
+    assert len(orchestrator.vector_db.get_all_note_ids()) == 3
+
+
+def test_path_to_file_mapping_includes_assets(notes_with_content: Path) -> None:
+    """Test that images and excalidraw drawings anywhere in the vault are mapped."""
+    assets = notes_with_content / "subfolder" / "assets"
+    assets.mkdir()
+    (assets / "diagram.png").write_bytes(b"png")
+    (assets / "diagram.excalidraw").write_text("{}")
+    (notes_with_content / "photo.jpg").write_bytes(b"jpg")
+
+    files = list(notes_with_content.rglob("*.md"))
+    mapping = IngestionOrchestrator._get_path_to_file_mapping(files, notes_with_content)
+
+    assert mapping["photo.jpg"] == "image:photo.jpg"
+    assert mapping["subfolder/assets/diagram.png"] == "image:subfolder/assets/diagram.png"
+    assert mapping["diagram"] == "excalidraw:subfolder/assets/diagram.excalidraw"
+    assert mapping["note3"] == IngestionOrchestrator._generate_note_id(
+        notes_with_content / "subfolder" / "note3.md", notes_with_content
+    )
+
+
+def test_unchanged_chunks_keep_their_vectors(notes_directory: Path, tmp_path: Path) -> None:
+    """Test that only chunks whose text changed are embedded again."""
+    embedded_texts: list[str] = []
+
+    class RecordingEmbedder(FakeEmbedder):
+        def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+            embedded_texts.extend(texts)
+            return super().embed_batch(texts)
+
+    note = notes_directory / "long.md"
+    note.write_text("# Intro\nFirst section.\n\n# Middle\nSecond section.\n\n# End\nLast section.")
+
+    orchestrator = IngestionOrchestrator(
+        embedder=RecordingEmbedder(),
+        vector_db=LocalVectorDB(tmp_path / "vector_db.json"),
+        image_store=FakeImageStore(),
+        max_tokens=5,
+        overlap=0,
+    )
+    orchestrator.ingest(notes_directory)
+    assert len(embedded_texts) == 3
+
+    embedded_texts.clear()
+    time.sleep(0.01)
+    note.write_text("# Intro\nFirst section.\n\n# Middle\nEdited section.\n\n# End\nLast section.")
+    orchestrator.ingest(notes_directory)
+
+    assert embedded_texts == ["# Middle\nEdited section."]
+    stored_chunks = orchestrator.vector_db.get_chunks_by_note_ids(
+        list(orchestrator.vector_db.get_all_note_ids())
+    )
+    assert len(stored_chunks) == 3
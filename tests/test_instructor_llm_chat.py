@@ -0,0 +1,64 @@
+"""Tests for InstructorLLMChat functionality."""
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, AsyncGenerator
+
+from jesktop.llms.instructor_llm_chat import InstructorLLMChat
+from jesktop.llms.schemas import AssistantResponse, LLMMessage, NoteReference, RelevantNote
+
+
+def _partial(**fields: Any) -> AssistantResponse:
+    """Build a partial response the way a streamed structured output fills it in."""
+    defaults = {
+        "no_information": None,
+        "summary": None,
+        "relevant_notes": None,
+        "additional_context": None,
+    }
+    return AssistantResponse.model_construct(**{**defaults, **fields})
+
+
+REFERENCE = NoteReference(note_id="note1", title="Bananas", link="[Bananas](/note/note1)")
+PARTIALS = [
+    _partial(),
+    _partial(no_information=False),
+    _partial(no_information=False, summary="The notes"),
+    _partial(no_information=False, summary="The notes are about bananas."),
+    _partial(
+        no_information=False,
+        summary="The notes are about bananas.",
+        relevant_notes=[RelevantNote.model_construct(note_reference=REFERENCE, text=None)],
+    ),
+    _partial(
+        no_information=False,
+        summary="The notes are about bananas.",
+        relevant_notes=[RelevantNote(note_reference=REFERENCE, text="> Bananas are yellow")],
+        additional_context="See also fruit.",
+    ),
+]
+
+
+def _fake_instructor(partials: list[AssistantResponse]) -> Any:
+    async def create_partial(**kwargs: Any) -> AsyncGenerator[AssistantResponse, None]:  # noqa: ARG001
+        for partial in partials:
+            yield partial
+
+    return SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create_partial=create_partial))
+    )
+
+
+def test_chat_stream_yields_only_new_content() -> None:
+    """Test that streamed messages add up to the final answer without repeating content."""
+    chat = InstructorLLMChat(_fake_instructor(PARTIALS))
+
+    async def collect() -> list[str]:
+        messages = [LLMMessage(role="user", content="What about bananas?")]
+        return [message.content async for message in chat.chat_stream(messages)]
+
+    deltas = asyncio.run(collect())
+
+    assert "".join(deltas) == PARTIALS[-1].answer
+    assert deltas[0] == "## Summary"
+    assert all(deltas)
@@ -1,6 +1,8 @@
 """Integration test for complete ingestion to serving pipeline."""
 
 import json
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 import pytest
@@ -101,7 +103,7 @@ def ingested_data(
     """Run ingestion on test data and return storage file paths."""
     # Create storage file paths
     vector_db_path = tmp_path / "vector.json"
-    image_store_path = tmp_path / "images.json"
+    image_store_path = tmp_path / "images.db"
 
     # Set up ingestion with fake embedder to avoid API calls
     embedder = fake_embedder
@@ -170,19 +172,17 @@ def test_complete_ingestion_to_serving_pipeline(ingested_data: dict[str, Path])
     assert "links" in relationships or len(relationships) > 0, "Should have built relationships"
 
     # Load and verify image store contents
-    with open(image_store_path, "r") as f:
-        image_data = json.load(f)
-
-    assert "images" in image_data, "Image store should contain images section"
-    images = image_data["images"]
+    with closing(sqlite3.connect(image_store_path)) as connection:
+        images = connection.execute(
+            "SELECT relative_path, content, mime_type FROM images"
+        ).fetchall()
     assert len(images) >= 0, "Should have processed images or handled missing images gracefully"
 
     # If images were processed, verify they have the expected structure
-    if len(images) > 0:
-        for img in images.values():
-            assert "relative_path" in img, "Images should have relative_path"
-            assert "content" in img, "Images should have content"
-            assert "mime_type" in img, "Images should have mime_type"
+    for relative_path, content, mime_type in images:
+        assert relative_path, "Images should have relative_path"
+        assert content, "Images should have content"
+        assert mime_type, "Images should have mime_type"
 
     # Find the main note ID for testing
     main_note_id = None
@@ -239,7 +239,7 @@ def test_error_handling_in_integration_pipeline(
 
     # Create storage paths
     vector_db_path = temp_notes_base / "vector.json"
-    image_store_path = temp_notes_base / "images.json"
+    image_store_path = temp_notes_base / "images.db"
 
     # Set up ingestion
     embedder = fake_embedder
@@ -268,11 +268,10 @@ def test_error_handling_in_integration_pipeline(
     assert "chunks" in vector_data, "Vector database should have chunks section"
     assert len(vector_data["chunks"]) == 0, "Should have no chunks for empty directory"
 
-    with open(image_store_path, "r") as f:
-        image_data = json.load(f)
+    with closing(sqlite3.connect(image_store_path)) as connection:
+        image_count = connection.execute("SELECT COUNT(*) FROM images").fetchone()[0]
 
-    assert "images" in image_data, "Image store should have images section"
-    assert len(image_data["images"]) == 0, "Should have no images for empty directory"
+    assert image_count == 0, "Should have no images for empty directory"
 
 
 def test_incremental_ingestion_integration(
@@ -289,7 +288,7 @@ def test_incremental_ingestion_integration(
     """
     notes_dir = integration_test_data["notes_dir"]
     vector_db_path = tmp_path / "vector.json"
-    image_store_path = tmp_path / "images.json"
+    image_store_path = tmp_path / "images.db"
 
     # Set up ingestion with real storage
     embedder = fake_embedder
@@ -437,7 +436,7 @@ def test_incremental_ingestion_with_relationship_updates(
     notes_dir.mkdir()
 
     vector_db_path = temp_notes_base / "vector.json"
-    image_store_path = temp_notes_base / "images.json"
+    image_store_path = temp_notes_base / "images.db"
 
     # Set up storage
     vector_db = LocalVectorDB(filepath=vector_db_path)
@@ -1,7 +1,9 @@
 """Tests for LocalImageStore functionality."""
 
-import json
+import sqlite3
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
 
 import pytest
@@ -115,7 +117,7 @@ def test_multiple_images(sample_image: Image, second_image: Image) -> None:
 
 def test_save_and_load_functionality(sample_image: Image, second_image: Image) -> None:
     """Test saving to and loading from file."""
-    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
         filepath = f.name
 
     Path(filepath).unlink()
@@ -128,13 +130,10 @@ def test_save_and_load_functionality(sample_image: Image, second_image: Image) -
         store.save()
 
         assert Path(filepath).exists(), "File should be created after save"
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        with closing(sqlite3.connect(filepath)) as connection:
+            saved_ids = {row[0] for row in connection.execute("SELECT id FROM images")}
 
-        assert "images" in data, "Saved data should contain images section"
-        assert len(data["images"]) == 2, "Should save 2 images"
-        assert "test_hash_123" in data["images"], "Should save first image"
-        assert "test_hash_789" in data["images"], "Should save second image"
+        assert saved_ids == {"test_hash_123", "test_hash_789"}, "Should save both images"
 
         new_store = LocalImageStore(filepath=filepath)
 
@@ -165,7 +164,7 @@ def test_save_without_filepath() -> None:
 
 def test_save_with_explicit_filepath(sample_image: Image) -> None:
     """Test saving with explicit filepath parameter."""
-    with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".db", delete=False) as f:
         filepath = f.name
 
     try:
@@ -188,7 +187,7 @@ def test_save_with_explicit_filepath(sample_image: Image) -> None:
 
 def test_auto_load_nonexistent_file() -> None:
     """Test that LocalImageStore handles nonexistent files gracefully."""
-    nonexistent_path = "/tmp/definitely_does_not_exist_12345.json"
+    nonexistent_path = "/tmp/definitely_does_not_exist_12345.db"
 
     store = LocalImageStore(filepath=nonexistent_path)
     assert store.get_image_ids() == [], "Should create empty store for nonexistent file"
@@ -222,3 +221,87 @@ def test_overwrite_image_with_same_id(sample_image: Image) -> None:
     assert retrieved.note_id == "different_note", "Image note_id should be updated"
     assert retrieved.relative_path == "modified_path.gif", "Image relative_path should be updated"
     assert retrieved.content == b"modified content", "Image content should be updated"
+
+
+def test_get_image_id_by_path_after_overwrite(sample_image: Image) -> None:
+    """Test that the path lookup follows an image when it is overwritten."""
+    store = LocalImageStore()
+    store.add_image(sample_image)
+
+    moved_image = sample_image.model_copy(update={"relative_path": "moved.png"})
+    store.add_image(moved_image)
+
+    assert store.get_image_id_by_path("note_456", "moved.png") == "test_hash_123", (
+        "Should find image by its new path"
+    )
+    assert store.get_image_id_by_path("note_456", "test_image.png") is None, (
+        "Old path should no longer resolve after overwrite"
+    )
+
+
+def test_loaded_store_persists_new_images(sample_image: Image, second_image: Image) -> None:
+    """Test that images added to a loaded store are written back to the same file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        filepath = Path(temp_dir) / "images.db"
+
+        store = LocalImageStore(filepath=filepath)
+        store.add_image(sample_image)
+        store.save()
+
+        loaded_store = LocalImageStore(filepath=filepath)
+        loaded_store.add_image(second_image)
+        loaded_store.save()
+
+        reloaded_store = LocalImageStore(filepath=filepath)
+        assert set(reloaded_store.get_image_ids()) == {"test_hash_123", "test_hash_789"}, (
+            "Should keep existing images and persist newly added ones"
+        )
+        assert reloaded_store.get_image("test_hash_789").content == b"another fake image", (
+            "Should persist image content as raw bytes"
+        )
+
+
+def test_iter_image_content_in_chunks(sample_image: Image) -> None:
+    """Test that image content can be read back in bounded chunks."""
+    store = LocalImageStore()
+    store.add_image(sample_image)
+
+    chunks = list(store.iter_image_content("test_hash_123", chunk_size=4))
+
+    assert all(len(chunk) <= 4 for chunk in chunks), "Chunks should not exceed chunk_size"
+    assert b"".join(chunks) == b"fake image content", "Chunks should reassemble the content"
+    assert store.get_image_mime_type_and_size("test_hash_123") == ("image/png", 18), (
+        "Should return the stored MIME type and content size"
+    )
+
+    with pytest.raises(KeyError, match="Image nonexistent not found"):
+        store.get_image_mime_type_and_size("nonexistent")
+
+
+def test_concurrent_adds_keep_every_image() -> None:
+    """Test that images added from several threads at once are all stored."""
+    images = [
+        Image(
+            id=f"hash_{index}",
+            note_id=f"note_{index % 4}",
+            content=bytes([index]) * 64 * 1024,
+            mime_type="image/png",
+            relative_path=f"image_{index}.png",
+            absolute_path=f"/path/to/image_{index}.png",
+        )
+        for index in range(64)
+    ]
+
+    # The race only loses an image now and then, so repeat the concurrent inserts
+    for _ in range(50):
+        store = LocalImageStore()
+
+        def add(image: Image, store: LocalImageStore = store) -> str | None:
+            store.add_image(image)
+            return store.get_image_id_by_path(image.note_id, image.relative_path)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            found = list(executor.map(add, images))
+
+        assert found == [image.id for image in images], "Each image should be found after adding"
+        assert len(store.get_image_ids()) == len(images), "Should store every image"
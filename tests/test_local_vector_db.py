@@ -131,6 +131,45 @@ def test_add_and_retrieve_chunk(first_chunk: EmbeddedChunk) -> None:
     assert chunk.text == "This is test content", "Chunk text should match original content"
 
 
+def test_bulk_writes(
+    first_note: Note,
+    second_note: Note,
+    first_chunk: EmbeddedChunk,
+    second_chunk: EmbeddedChunk,
+    third_chunk: EmbeddedChunk,
+) -> None:
+    """Test adding notes and chunks and deleting chunks of several notes at once."""
+    db = LocalVectorDB()
+    db.update_notes([first_note, second_note])
+    db.add_chunks([first_chunk, second_chunk, third_chunk])
+
+    assert db.get_all_note_ids() == {"note_123", "note_456"}
+    assert len(db.get_closest_chunks(np.array([0.1, 0.2, 0.3, 0.4, 0.5]), closest=5)) == 3
+
+    db.delete_chunks_for_notes(["note_456", "missing"])
+
+    closest_chunks = db.get_closest_chunks(np.array([0.1, 0.2, 0.3, 0.4, 0.5]), closest=5)
+    assert [chunk.id for chunk in closest_chunks] == ["note_123_0"]
+    assert db.get_all_note_ids() == {"note_123", "note_456"}
+
+
+def test_chunks_are_deleted_with_the_note_they_belong_to(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk, third_chunk: EmbeddedChunk
+) -> None:
+    """Test that a chunk re-added under another note is deleted with its new note."""
+    db = LocalVectorDB()
+    db.add_chunks([first_chunk, second_chunk, third_chunk])
+    db.add_chunk(third_chunk.model_copy(update={"note_id": "note_123"}))
+
+    assert {chunk.id for chunk in db.get_chunks_by_note_ids(["note_456"])} == {"note_456_0"}
+
+    db.delete_chunks_for_note("note_123")
+
+    assert [chunk.id for chunk in db.get_chunks_by_note_ids(["note_123", "note_456"])] == [
+        "note_456_0"
+    ]
+
+
 def test_find_note_by_title(first_note: Note, second_note: Note) -> None:
     """Test finding notes by title."""
     db = LocalVectorDB()
@@ -151,6 +190,23 @@ def test_find_note_by_title(first_note: Note, second_note: Note) -> None:
     )
 
 
+def test_find_note_by_title_reflects_note_changes(first_note: Note, second_note: Note) -> None:
+    """Test that title lookups see notes updated or deleted after a previous lookup."""
+    db = LocalVectorDB()
+    db.update_note(first_note)
+    assert db.find_note_by_title("second note") is None
+
+    db.update_note(second_note)
+    assert db.find_note_by_title("second note").id == "note_456"
+
+    db.update_note(second_note.model_copy(update={"title": "Renamed Note"}))
+    assert db.find_note_by_title("renamed_note").id == "note_456"
+    assert db.find_note_by_title("second_note").id == "note_456", "Should match the file stem"
+
+    db.delete_note("note_456")
+    assert db.find_note_by_title("Renamed Note") is None
+
+
 def test_related_notes(first_note: Note, second_note: Note) -> None:
     """Test finding related notes through links."""
     db = LocalVectorDB()
@@ -200,6 +256,22 @@ def test_find_path_between_notes(first_note: Note, second_note: Note) -> None:
     assert path == ["note_123"], "Path to self should return single note"
 
 
+def test_find_path_between_notes_follows_links_in_one_direction(first_note: Note) -> None:
+    """Test that paths follow links recorded on only one of the notes, and see new links."""
+    chain = [
+        first_note.model_copy(update={"id": f"note_{i}", "outbound_links": [f"note_{i + 1}"]})
+        for i in range(5)
+    ]
+    db = LocalVectorDB()
+    db.update_notes(chain)
+
+    assert db.find_path_between_notes("note_0", "note_4") == [f"note_{i}" for i in range(5)]
+    assert db.find_path_between_notes("note_4", "note_0") == []
+
+    db.update_note(chain[4].model_copy(update={"outbound_links": ["note_0"]}))
+    assert db.find_path_between_notes("note_4", "note_0") == ["note_4", "note_0"]
+
+
 def test_relationship_context(sample_relationship_graph: RelationshipGraph) -> None:
     """Test getting relationship context."""
     db = LocalVectorDB()
@@ -211,6 +283,11 @@ def test_relationship_context(sample_relationship_graph: RelationshipGraph) -> N
     context = db.get_relationship_context("note_123", "note_456")
     assert context == "", "Should return empty string for non-existent relationship"
 
+    db.update_relationship_graph(RelationshipGraph())
+    assert db.get_relationship_context("note_456", "note_123") == "", (
+        "Should not return context from a replaced relationship graph"
+    )
+
 
 def test_clear_functionality(first_note: Note, first_chunk: EmbeddedChunk) -> None:
     """Test clearing all data from the database."""
@@ -339,6 +416,41 @@ def test_cosine_similarity_calculation(
     assert closest_chunks[1].id == "note_123_0", "First chunk should have lower similarity"
 
 
+def test_closest_chunks_are_ranked_when_fewer_than_all_requested(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk, third_chunk: EmbeddedChunk
+) -> None:
+    """Test that only the top chunks are returned, ordered by similarity."""
+    db = LocalVectorDB()
+    db.add_chunk(first_chunk)
+    db.add_chunk(second_chunk)
+    db.add_chunk(third_chunk)
+
+    query_vector = np.array([0.5, 0.4, 0.3, 0.2, 0.1])
+    all_ids = [chunk.id for chunk in db.get_closest_chunks(query_vector, closest=3)]
+    top_ids = [chunk.id for chunk in db.get_closest_chunks(query_vector, closest=2)]
+
+    assert top_ids == all_ids[:2]
+    assert db.get_closest_chunks(query_vector, closest=0) == []
+
+
+def test_closest_chunks_batch_matches_single_queries(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk, third_chunk: EmbeddedChunk
+) -> None:
+    """Test that a batch of queries returns the same chunks as querying one at a time."""
+    db = LocalVectorDB()
+    db.add_chunk(first_chunk)
+    db.add_chunk(second_chunk)
+    db.add_chunk(third_chunk)
+
+    query_vectors = np.array([[0.1, 0.2, 0.3, 0.4, 0.5], [0.5, 0.4, 0.3, 0.2, 0.1]])
+    batch_results = db.get_closest_chunks_batch(query_vectors, closest=2)
+
+    assert [[c.id for c in chunks] for chunks in batch_results] == [
+        [c.id for c in db.get_closest_chunks(vector, closest=2)] for vector in query_vectors
+    ]
+    assert LocalVectorDB().get_closest_chunks_batch(query_vectors, closest=2) == [[], []]
+
+
 def test_multiple_chunks_from_same_note(
     second_chunk: EmbeddedChunk, third_chunk: EmbeddedChunk
 ) -> None:
@@ -362,3 +474,86 @@ def test_multiple_chunks_from_same_note(
     chunk_texts = {chunk.text for chunk in closest_chunks}
     assert "This is more test content" in chunk_texts, "Should include first chunk text"
     assert " It references the [[First Note]]." in chunk_texts, "Should include second chunk text"
+
+
+def test_search_reflects_changes_after_previous_search(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk
+) -> None:
+    """Test that chunks added or deleted after a search are reflected in later searches."""
+    db = LocalVectorDB()
+    db.add_chunk(first_chunk)
+
+    query_vector = np.array([0.5, 0.4, 0.3, 0.2, 0.1])
+    assert [c.id for c in db.get_closest_chunks(query_vector, closest=2)] == ["note_123_0"]
+
+    db.add_chunk(second_chunk)
+    assert [c.id for c in db.get_closest_chunks(query_vector, closest=2)] == [
+        "note_456_0",
+        "note_123_0",
+    ], "Newly added chunk should be searchable"
+
+    db.delete_chunks_for_note("note_456")
+    assert [c.id for c in db.get_closest_chunks(query_vector, closest=2)] == ["note_123_0"], (
+        "Deleted chunk should no longer be returned"
+    )
+
+
+def test_zero_query_vector_returns_chunks(first_chunk: EmbeddedChunk) -> None:
+    """Test that a zero query vector does not break the similarity computation."""
+    db = LocalVectorDB()
+    db.add_chunk(first_chunk)
+
+    closest_chunks = db.get_closest_chunks(np.zeros(5), closest=1)
+    assert [chunk.id for chunk in closest_chunks] == ["note_123_0"]
+
+
+def test_chunk_vectors_share_search_matrix(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk
+) -> None:
+    """Test that stored chunk vectors are views into the search matrix after a search."""
+    db = LocalVectorDB()
+    db.add_chunk(first_chunk)
+    db.add_chunk(second_chunk)
+
+    db.get_closest_chunks(np.array([0.1, 0.2, 0.3, 0.4, 0.5]), closest=1)
+
+    for chunk in (first_chunk, second_chunk):
+        assert chunk.vector.dtype == np.float32, "Chunk vectors should be float32"
+        assert chunk.vector.base is not None, "Chunk vectors should be views into the matrix"
+    np.testing.assert_allclose(first_chunk.vector, [0.1, 0.2, 0.3, 0.4, 0.5], rtol=1e-6)
+
+
+def test_save_stores_vectors_in_npy_file(
+    first_chunk: EmbeddedChunk, second_chunk: EmbeddedChunk, tmp_path: Path
+) -> None:
+    """Test that vectors are saved to a .npy file next to the JSON metadata."""
+    filepath = tmp_path / "vector.json"
+    db = LocalVectorDB(filepath=filepath)
+    db.add_chunk(first_chunk)
+    db.add_chunk(second_chunk)
+    db.save()
+
+    with open(filepath, "r") as f:
+        data = json.load(f)
+    assert all("vector" not in chunk for chunk in data["chunks"].values()), (
+        "Chunk metadata should not contain vectors"
+    )
+    vectors = np.load(tmp_path / "vector.npy")
+    assert vectors.shape == (2, 5), "Should save one vector row per chunk"
+
+    loaded_db = LocalVectorDB(filepath=filepath)
+    closest_chunks = loaded_db.get_closest_chunks(np.array([0.5, 0.4, 0.3, 0.2, 0.1]), closest=2)
+    assert [chunk.id for chunk in closest_chunks] == ["note_456_0", "note_123_0"], (
+        "Loaded vectors should stay aligned with their chunks"
+    )
+
+
+def test_load_database_with_inline_vectors(first_chunk: EmbeddedChunk, tmp_path: Path) -> None:
+    """Test that databases saved with vectors inline in the JSON file still load."""
+    filepath = tmp_path / "vector.json"
+    with open(filepath, "w") as f:
+        json.dump({"notes": {}, "chunks": {first_chunk.id: first_chunk.model_dump()}}, f)
+
+    db = LocalVectorDB(filepath=filepath)
+    closest_chunks = db.get_closest_chunks(np.array([0.1, 0.2, 0.3, 0.4, 0.5]), closest=1)
+    assert [chunk.id for chunk in closest_chunks] == ["note_123_0"]
@@ -1,5 +1,8 @@
 """Tests for PathResolver functionality."""
 
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -132,3 +135,67 @@ def test_path_resolver_logging() -> None:
     ]
 
     assert len(required_log_events) == 7  # All resolution steps should be logged
+
+
+def test_path_resolver_checks_candidates_against_one_scan(
+    path_resolver: PathResolver,
+    sample_note_file: Path,
+    global_image: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that candidates inside the base folder are resolved without a stat call each."""
+
+    def fail_exists(self: Path, **kwargs: object) -> bool:  # noqa: ARG001
+        raise AssertionError(f"Unexpected stat of {self}")
+
+    path_resolver._index  # noqa: B018
+    monkeypatch.setattr(Path, "exists", fail_exists)
+
+    assert path_resolver.resolve_image_path(sample_note_file, "global_image.png") == global_image
+    assert path_resolver.resolve_image_path(sample_note_file, "nonexistent.png") is None
+
+
+def test_path_resolver_follows_symlinked_folders(
+    path_resolver: PathResolver, sample_note_file: Path, tmp_path: Path
+) -> None:
+    """Test that images inside symlinked folders and outside the base folder still resolve."""
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "linked.png").write_bytes(b"linked")
+    (sample_note_file.parent / "linked").symlink_to(outside, target_is_directory=True)
+
+    result = path_resolver.resolve_image_path(sample_note_file, "linked/linked.png")
+    assert result == sample_note_file.parent / "linked" / "linked.png"
+
+    outside_path = os.path.relpath(outside / "linked.png", sample_note_file.parent)
+    result = path_resolver.resolve_image_path(sample_note_file, outside_path)
+    assert result is not None and result.resolve() == (outside / "linked.png").resolve()
+
+
+def test_path_resolver_scans_once_for_concurrent_lookups(
+    path_resolver: PathResolver,
+    sample_note_file: Path,
+    global_image: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that lookups from several threads share a single scan of the base folder."""
+    scans = []
+    scan = PathResolver._scan
+
+    def slow_scan(self: PathResolver) -> tuple[frozenset[str], frozenset[str]]:
+        scans.append(self)
+        time.sleep(0.05)
+        return scan(self)
+
+    monkeypatch.setattr(PathResolver, "_scan", slow_scan)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(
+                lambda _: path_resolver.resolve_image_path(sample_note_file, "global_image.png"),
+                range(8),
+            )
+        )
+
+    assert results == [global_image] * 8
+    assert len(scans) == 1
@@ -5,8 +5,13 @@ from pathlib import Path
 
 import pytest
 
+from jesktop.domain.note import Note
 from jesktop.ingestion.content_extractor import ContentExtractor
-from jesktop.ingestion.relationship_extraction import ReferenceResolver, analyzer
+from jesktop.ingestion.relationship_extraction import (
+    ReferenceResolver,
+    RelationshipGraphBuilder,
+    analyzer,
+)
 
 
 def test_link_extraction() -> None:
@@ -51,6 +56,23 @@ def test_reference_resolution() -> None:
     assert len(resolved) == 3  # Nonexistent should not be included
 
 
+def test_reference_resolution_fallbacks() -> None:
+    """Test resolution by path stem and by case-insensitive asset name."""
+    note_mapping = {
+        "folder/Deep Note.md": "note_id_1",
+        "other/Deep Note.md": "note_id_2",
+        "images/Diagram.PNG": "image:images/Diagram.PNG",
+    }
+
+    resolver = ReferenceResolver(note_mapping)
+
+    assert resolver.resolve_references(["Deep Note"]) == ["note_id_1"]
+    assert resolver.resolve_references(["diagram", "images/diagram.png"]) == [
+        "image:images/Diagram.PNG",
+        "image:images/Diagram.PNG",
+    ]
+
+
 def test_image_reference_resolution() -> None:
     """Test image file reference resolution."""
     note_mapping = {
@@ -310,6 +332,30 @@ def test_relationship_strength_edge_cases() -> None:
     assert strength >= 0.2  # Should get header boost
 
 
+def test_relationship_strength_boosts_header_mentions() -> None:
+    """Test that a mention in a Markdown header counts more than one in body text."""
+    body_strength = analyzer.calculate_relationship_strength("Text about Target", "Target")
+    header_strength = analyzer.calculate_relationship_strength("## About target\nText", "Target")
+    tag_strength = analyzer.calculate_relationship_strength("#tag about Target", "Target")
+
+    assert body_strength == pytest.approx(0.3)
+    assert header_strength == pytest.approx(0.5)
+    assert tag_strength == pytest.approx(0.3)
+
+
+def test_analyze_relationship_matches_separate_analysis() -> None:
+    """Test that the single-pass analysis returns the same strength and context."""
+    content = (
+        "# Pensieve notes\nIntro.\n\n## More on pensieve and Pensieve\nPensieve body #Pensieve"
+    )
+
+    strength, context = analyzer.analyze_relationship(content, "Pensieve", context_chars=20)
+
+    assert strength == analyzer.calculate_relationship_strength(content, "Pensieve")
+    assert context == analyzer.extract_relationship_context(content, "Pensieve", 20)
+    assert analyzer.analyze_relationship(content, "Missing") == (0.0, "")
+
+
 def test_relationship_context_edge_cases() -> None:
     """Test relationship context extraction edge cases."""
     # No mention
@@ -325,3 +371,68 @@ def test_relationship_context_edge_cases() -> None:
     context = analyzer.extract_relationship_context(long_content, "Target", context_chars=50)
     assert len(context) <= 150  # Should be trimmed
     assert "Target" in context
+
+
+def test_scan_extracts_all_reference_types_in_one_pass() -> None:
+    """Test that scan returns the same references as the individual extractors."""
+    content = (
+        "See [[Pensieve|the pensieve]] and ![[drawing.excalidraw]].\n"
+        "![diagram](images/diagram (1).png) ![[photo.png]] ![[Other Note]]\n"
+        '<img src="inline.jpg"> ![](https://example.com/remote.png)'
+    )
+
+    scanned = ContentExtractor.scan(content)
+
+    assert scanned == {
+        "image_paths": ["images/diagram (1).png", "photo.png", "inline.jpg"],
+        "wikilinks": ["Pensieve", "drawing.excalidraw", "photo.png", "Other Note"],
+        "embeds": ["drawing.excalidraw", "photo.png", "Other Note"],
+        "excalidraw_refs": ["drawing.excalidraw"],
+    }
+    assert scanned["image_paths"] == ContentExtractor.extract_image_paths(content)
+    assert scanned["wikilinks"] == ContentExtractor.extract_wikilinks(content)
+    assert scanned["embeds"] == ContentExtractor.extract_embedded_content(content)
+
+
+def test_build_relationships_rebuilds_inbound_links() -> None:
+    """Test that building relationships replaces inbound links with the linking notes."""
+    notes = {
+        note_id: Note(
+            id=note_id,
+            title=f"Note {note_id}",
+            path=f"/notes/{note_id}.md",
+            content=f"About Note {note_id}",
+            created=0.0,
+            modified=0.0,
+            outbound_links=outbound_links,
+            inbound_links=["stale"],
+        )
+        for note_id, outbound_links in {
+            "a": ["b", "c", "image:a.png"],
+            "b": ["c"],
+            "c": [],
+        }.items()
+    }
+
+    graph = RelationshipGraphBuilder().build_relationships(notes)
+
+    assert len(graph.relationships) == 3
+    assert notes["a"].inbound_links == []
+    assert notes["b"].inbound_links == ["a"]
+    assert notes["c"].inbound_links == ["a", "b"]
+
+
+def test_scan_ignores_unclosed_wikilinks() -> None:
+    """Test that an unclosed [[ does not hide the references after it."""
+    scanned = ContentExtractor.scan("Typing [[ starts a link.\n\n![[photo.png]]\n\nSee [[Other]]")
+
+    assert scanned["image_paths"] == ["photo.png"]
+    assert scanned["wikilinks"] == ["photo.png", "Other"]
+
+
+def test_scan_finds_wikilinks_inside_image_tags() -> None:
+    """Test that wikilinks inside an HTML image tag are still reported."""
+    scanned = ContentExtractor.scan('<img src="a.png" alt="[[x]]">')
+
+    assert scanned["image_paths"] == ["a.png"]
+    assert scanned["wikilinks"] == ["x"]
@@ -0,0 +1,87 @@
+"""Tests for SemanticResponseCache functionality."""
+
+import asyncio
+from typing import AsyncGenerator
+
+import numpy as np
+
+from jesktop.llms.schemas import LLMMessage
+from jesktop.llms.semantic_response_cache import SemanticResponseCache
+
+VECTORS = {
+    "What did I write about bananas?": [1.0, 0.0, 0.0],
+    "What have I written about bananas?": [0.99, 0.1, 0.0],
+    "What did I write about emojis?": [0.0, 1.0, 0.0],
+}
+
+
+class LookupEmbedder:
+    """Embedder that returns a fixed vector per known text."""
+
+    def embed(self, text: str) -> np.ndarray:
+        return np.array(VECTORS[text], dtype=np.float32)
+
+    def embed_batch(self, texts: list[str]) -> list[np.ndarray]:
+        return [self.embed(text) for text in texts]
+
+
+class Answerer:
+    """Answers every question from the same notes, counting the answers it streams."""
+
+    def __init__(self) -> None:
+        self.answers = 0
+
+    async def answer(self, question: str) -> AsyncGenerator[LLMMessage, None]:
+        self.answers += 1
+        return self._stream(f"From the banana notes: {question}")
+
+    @staticmethod
+    async def _stream(content: str) -> AsyncGenerator[LLMMessage, None]:
+        for part in content.split(" "):
+            yield LLMMessage(role="assistant", content=part)
+
+
+async def _ask(cache: SemanticResponseCache, answerer: Answerer, question: str) -> str:
+    stream = cache.stream(question, lambda: answerer.answer(question))
+    return " ".join([message.content async for message in stream])
+
+
+def test_similar_questions_are_answered_from_cache() -> None:
+    """Test that a question close to a cached one reuses its streamed answer."""
+    answerer = Answerer()
+    cache = SemanticResponseCache(LookupEmbedder())
+
+    first = asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    similar = asyncio.run(_ask(cache, answerer, "What have I written about bananas?"))
+
+    assert first == similar == "From the banana notes: What did I write about bananas?"
+    assert answerer.answers == 1
+
+
+def test_different_questions_with_the_same_context_get_their_own_answers() -> None:
+    """Test that questions are not matched by the notes retrieved for them."""
+    answerer = Answerer()
+    cache = SemanticResponseCache(LookupEmbedder())
+
+    bananas = asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    emojis = asyncio.run(_ask(cache, answerer, "What did I write about emojis?"))
+
+    assert bananas.endswith("bananas?")
+    assert emojis.endswith("emojis?")
+    assert answerer.answers == 2
+
+
+def test_cached_answers_expire_and_are_evicted() -> None:
+    """Test that the cache honours the TTL and its size limit."""
+    answerer = Answerer()
+    cache = SemanticResponseCache(LookupEmbedder(), ttl_seconds=0.0)
+
+    asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    assert answerer.answers == 2
+
+    cache = SemanticResponseCache(LookupEmbedder(), max_entries=1)
+    asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    asyncio.run(_ask(cache, answerer, "What did I write about emojis?"))
+    asyncio.run(_ask(cache, answerer, "What did I write about bananas?"))
+    assert answerer.answers == 5
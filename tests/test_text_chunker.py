@@ -125,3 +125,51 @@ This is the third section with even more content to ensure proper chunking behav
             chunk for chunk in chunks_without_overlap if "Previous context:" in chunk
         ]
         assert len(overlapped_chunks) == 0
+
+
+def test_text_chunker_offsets_cover_chunk_source() -> None:
+    """Test that chunk offsets point at the part of the input each chunk was built from."""
+    chunker = TextChunker(max_tokens=15, overlap=5)
+
+    text = """# First Header
+
+This is the first section with some content that will span multiple chunks.
+
+# Second Header
+
+This is the second section with more content that will also span multiple chunks."""
+
+    chunks_with_offsets = chunker.chunk_text_with_offsets(text)
+
+    assert [chunk for chunk, _, _ in chunks_with_offsets] == chunker.chunk_text(text)
+    assert chunks_with_offsets[0][1] == 0
+    assert chunks_with_offsets[-1][2] == len(text)
+    for (_, _, previous_end), (_, start, _) in zip(
+        chunks_with_offsets, chunks_with_offsets[1:], strict=False
+    ):
+        assert previous_end <= start
+    for chunk, start, end in chunks_with_offsets:
+        assert chunk.endswith(text[start:end].split("\n\n")[-1])
+
+
+def test_text_chunker_overlap_is_tail_of_previous_chunk() -> None:
+    """Test that the overlap context is the last overlap tokens of the previous chunk."""
+    chunker = TextChunker(max_tokens=30, overlap=8)
+    no_overlap_chunker = TextChunker(max_tokens=30, overlap=0)
+
+    text = "\n\n".join(
+        f"## Part {i}\n\nShort line {i}.\n\nA somewhat longer paragraph, number {i}, with punctuation!"
+        for i in range(6)
+    )
+
+    plain_chunks = no_overlap_chunker.chunk_text(text)
+    overlapped_chunks = chunker.chunk_text(text)
+
+    assert len(plain_chunks) > 2
+    assert overlapped_chunks[0] == plain_chunks[0]
+    assert len(overlapped_chunks) == len(plain_chunks)
+    for previous, chunk, overlapped in zip(
+        plain_chunks, plain_chunks[1:], overlapped_chunks[1:], strict=False
+    ):
+        context = chunker.enc.decode(chunker.enc.encode(previous)[-8:])
+        assert overlapped == f"Previous context: {context}\n\n{chunk}"